@@ -0,0 +1,113 @@
+"""Аутентификация по JWT без загрузки пользователя из базы."""
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .cache import cache_is_shared
+from .user_cache import UserSnapshot
+from reviews.models import User
+
+TOKEN_VERSION_KEY = 'token-version:{}'
+TOKEN_VERSION_CLAIM = 'token_version'
+# Поля пользователя, копии которых передаются в токене.
+TOKEN_CLAIMS = ('username', 'role', 'is_staff')
+# Версия удаленного пользователя: не совпадает ни с одним токеном.
+REVOKED_TOKEN_VERSION = -1
+
+
+def claims_enabled():
+    """
+    Данным токена можно доверять, только если версию токенов
+    видят все процессы: иначе сброс версии в одном процессе
+    не отзывает токены в остальных.
+    """
+    return cache_is_shared()
+
+
+def token_version_timeout():
+    return api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+
+
+def remember_token_version(user):
+    """
+    Запоминает версию токенов, прочитанную из базы. Запись не
+    заменяет уже сохраненную версию: ее пишет только 'store_token_version'.
+    """
+    cache.add(
+        TOKEN_VERSION_KEY.format(user.pk),
+        user.token_version,
+        timeout=token_version_timeout(),
+    )
+
+
+def store_token_version(user_id):
+    """
+    Записывает текущую версию токенов из базы после изменения
+    пользователя. Запрос, прочитавший старую версию до фиксации,
+    уже не сможет записать ее поверх новой.
+    """
+    version = User.objects.filter(pk=user_id).values_list(
+        'token_version', flat=True,
+    ).first()
+    cache.set(
+        TOKEN_VERSION_KEY.format(user_id),
+        REVOKED_TOKEN_VERSION if version is None else version,
+        timeout=token_version_timeout(),
+    )
+
+
+class ClaimsAccessToken(AccessToken):
+    """Токен доступа с ролью и версией токенов пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for name in TOKEN_CLAIMS:
+            token[name] = getattr(user, name)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        remember_token_version(user)
+        return token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Собирает пользователя из данных токена без запроса к базе.
+    Данным токена доверяем, пока его версия совпадает с версией
+    в общем для процессов кэше; остальные поля загружаются при первом
+    обращении к ним. Если версии в кэше нет или она другая,
+    пользователь загружается из базы.
+    Токены без этих данных, а также все токены при кэше в памяти
+    процесса проверяются по базе.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification'),
+            )
+        claims = {name: validated_token.get(name) for name in TOKEN_CLAIMS}
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if (
+            None not in claims.values()
+            and version is not None
+            and claims_enabled()
+        ):
+            if cache.get(TOKEN_VERSION_KEY.format(user_id)) == version:
+                return UserSnapshot(
+                    id=user_id, is_active=True, token_version=version,
+                    **claims,
+                ).to_user()
+            # Версию запоминаем только из базы: снимок в памяти другого
+            # процесса может быть старше изменения роли.
+            user = super().get_user(validated_token)
+            remember_token_version(user)
+            return user
+        # Снимки пользователей в памяти процесса не сбрасываются
+        # изменениями в других процессах, поэтому права проверяются
+        # по базе.
+        return super().get_user(validated_token)
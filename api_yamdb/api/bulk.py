@@ -0,0 +1,146 @@
+from django.db import transaction
+
+from .cache import touch_on_commit
+from .serializers import TitlesBulkSerializer
+from reviews.models import Category, Genre, Title
+from reviews.utils import bulk_create_with_ids
+
+TITLE_FIELDS = ('name', 'year', 'description')
+
+
+class TitlesBulkSaver:
+    """
+    Пакетное создание и изменение произведений.
+    Элементы проверяются по отдельности, категории и жанры всего пакета
+    загружаются двумя запросами, а запись выполняется пакетными
+    INSERT/UPDATE. Ошибочные элементы пропускаются и возвращаются
+    в 'errors' с индексом в исходном списке.
+    """
+
+    def __init__(self, items, partial=False):
+        self.items = items
+        self.partial = partial
+        self.errors = {}
+        self.saved_ids = []
+
+    def add_error(self, index, field, message):
+        self.errors.setdefault(index, {}).setdefault(field, []).append(
+            message,
+        )
+
+    def validate_items(self):
+        valid = []
+        seen_ids = set()
+        for index, item in enumerate(self.items):
+            serializer = TitlesBulkSerializer(data=item, partial=self.partial)
+            if not serializer.is_valid():
+                self.errors[index] = serializer.errors
+                continue
+            data = serializer.validated_data
+            if self.partial and 'id' not in data:
+                self.add_error(index, 'id', 'Обязательное поле.')
+                continue
+            if self.partial and data['id'] in seen_ids:
+                self.add_error(
+                    index, 'id', 'Произведение уже изменяется в пакете.',
+                )
+                continue
+            if self.partial:
+                seen_ids.add(data['id'])
+            if not self.partial:
+                data.pop('id', None)
+            valid.append((index, data))
+        return valid
+
+    def resolve_relations(self, valid):
+        categories = Category.objects.in_bulk(
+            {data['category'] for _, data in valid if 'category' in data},
+            field_name='slug',
+        )
+        genres = Genre.objects.in_bulk(
+            {slug for _, data in valid for slug in data.get('genre', ())},
+            field_name='slug',
+        )
+        titles = {}
+        if self.partial:
+            titles = Title.objects.in_bulk(
+                [data['id'] for _, data in valid],
+            )
+
+        resolved = []
+        for index, data in valid:
+            slug = data.get('category')
+            if slug is not None and slug not in categories:
+                self.add_error(
+                    index, 'category', f'Категория `{slug}` не найдена.',
+                )
+            for slug in data.get('genre', ()):
+                if slug not in genres:
+                    self.add_error(
+                        index, 'genre', f'Жанр `{slug}` не найден.',
+                    )
+            if self.partial and data['id'] not in titles:
+                self.add_error(index, 'id', 'Произведение не найдено.')
+            if index in self.errors:
+                continue
+            if 'category' in data:
+                data['category'] = categories[data['category']]
+            if 'genre' in data:
+                data['genre'] = [
+                    genres[slug] for slug in dict.fromkeys(data['genre'])
+                ]
+            title = titles[data['id']] if self.partial else Title()
+            resolved.append((title, data))
+        return resolved
+
+    def save(self):
+        resolved = self.resolve_relations(self.validate_items())
+        if not resolved:
+            return
+        with transaction.atomic():
+            if self.partial:
+                self.update_titles(resolved)
+            else:
+                self.create_titles(resolved)
+            self.replace_genres(
+                [(title, data) for title, data in resolved if 'genre' in data]
+            )
+            touch_on_commit('titles')
+        self.saved_ids = [title.pk for title, _ in resolved]
+
+    def create_titles(self, resolved):
+        for title, data in resolved:
+            for field in TITLE_FIELDS:
+                setattr(title, field, data.get(field, ''))
+            title.category = data['category']
+        bulk_create_with_ids(Title, [title for title, _ in resolved])
+
+    def update_titles(self, resolved):
+        fields = set()
+        for title, data in resolved:
+            for field in (*TITLE_FIELDS, 'category'):
+                if field in data:
+                    setattr(title, field, data[field])
+                    fields.add(field)
+        if fields:
+            Title.objects.bulk_update(
+                [title for title, _ in resolved], sorted(fields),
+            )
+
+    def replace_genres(self, resolved):
+        through = Title.genre.through
+        if self.partial:
+            through.objects.filter(
+                title_id__in=[title.pk for title, _ in resolved],
+            ).delete()
+        through.objects.bulk_create([
+            through(title_id=title.pk, genre_id=genre.pk)
+            for title, data in resolved
+            for genre in data['genre']
+        ])
+
+    def get_errors(self):
+        return [
+            {'index': index, 'errors': errors}
+            for index, errors in sorted(self.errors.items())
+        ]
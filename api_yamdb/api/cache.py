@@ -0,0 +1,140 @@
+"""Кэш ответов API с инвалидацией по версиям коллекций."""
+import hashlib
+import time
+from functools import partial, wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+COLLECTION_VERSION_KEY = 'collection-version:{}'
+RESPONSE_CACHE_KEY = 'response-cache:{}:{}'
+RESPONSE_STATS_KEY = 'response-cache-stats:{}:{}'
+CACHE_STATUS_HEADER = 'X-Cache'
+# Бэкенды, кэш которых виден только своему процессу.
+PER_PROCESS_CACHES = (LocMemCache, DummyCache)
+
+
+def cache_is_shared():
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], PER_PROCESS_CACHES)
+
+
+def collection_version_timeout():
+    """
+    Версии коллекций в общем кэше хранятся бессрочно. В кэше процесса
+    изменения из других процессов их не обновляют, поэтому версии
+    живут ограниченное время и устаревают не дольше, чем за него.
+    """
+    if cache_is_shared():
+        return None
+    return settings.COLLECTION_VERSION_TIMEOUT
+
+
+def new_collection_state(previous=None):
+    """
+    Новая версия коллекции. Время изменения растет хотя бы на секунду:
+    Last-Modified передается с точностью до секунд, и изменение в ту же
+    секунду, что и прошлый ответ, иначе не отменило бы If-Modified-Since.
+    """
+    modified = time.time()
+    if previous is not None:
+        modified = max(modified, int(previous[1]) + 1)
+    return uuid4().hex, modified
+
+
+def get_collection_state(name):
+    """
+    Возвращает версию коллекции и время ее последнего изменения.
+    Если версия вытеснена из кэша, создается новая - это лишь
+    сбрасывает зависящие от нее записи.
+    """
+    key = COLLECTION_VERSION_KEY.format(name)
+    state = cache.get(key)
+    if state is None:
+        cache.add(
+            key, new_collection_state(), collection_version_timeout()
+        )
+        state = cache.get(key)
+    return state
+
+
+def get_collection_version(name):
+    return get_collection_state(name)[0]
+
+
+def touch_collections(*names):
+    """Выдает коллекциям новые версии, делая устаревшими кэш ответов."""
+
+    keys = [COLLECTION_VERSION_KEY.format(name) for name in names]
+    previous = cache.get_many(keys)
+    cache.set_many(
+        {key: new_collection_state(previous.get(key)) for key in keys},
+        collection_version_timeout(),
+    )
+
+
+def touch_on_commit(*names):
+    """Обновляет версии коллекций после фиксации текущей транзакции."""
+
+    transaction.on_commit(partial(touch_collections, *names))
+
+
+def count_cache_event(name, event):
+    key = RESPONSE_STATS_KEY.format(name, event)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_response_cache_stats(name):
+    """Количество попаданий и промахов кэша ответов вьюсета."""
+
+    stats = {
+        event: cache.get(RESPONSE_STATS_KEY.format(name, event), 0)
+        for event in ('hits', 'misses')
+    }
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / total if total else 0.0
+    return stats
+
+
+def response_cache_key(view, request):
+    versions = ':'.join(
+        get_collection_version(name) for name in view.cache_collections
+    )
+    url = request.build_absolute_uri()
+    digest = hashlib.md5(f'{versions}|{url}'.encode('utf-8')).hexdigest()
+    return RESPONSE_CACHE_KEY.format(view.basename, digest)
+
+
+def cache_response(method):
+    """
+    Кэширует данные успешного ответа действия вьюсета.
+    Ключ составляется из полного адреса запроса и версий коллекций
+    из атрибута 'cache_collections' вьюсета, поэтому изменение
+    любой из них делает запись недоступной.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = response_cache_key(self, request)
+        data = cache.get(key)
+        if data is not None:
+            count_cache_event(self.basename, 'hits')
+            return Response(data, headers={CACHE_STATUS_HEADER: 'HIT'})
+
+        count_cache_event(self.basename, 'misses')
+        response = method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            response[CACHE_STATUS_HEADER] = 'MISS'
+        return response
+
+    return wrapper
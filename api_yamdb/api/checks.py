@@ -0,0 +1,36 @@
+from django.core.checks import Tags, Warning, register
+
+from .authentication import claims_enabled
+from .cache import cache_is_shared
+
+
+@register(Tags.caches)
+def check_claims_cache(app_configs, **kwargs):
+    if claims_enabled():
+        return []
+    return [Warning(
+        'Кэш по умолчанию виден только своему процессу, поэтому '
+        'данные токена не используются: пользователь каждого запроса '
+        'проверяется без них.',
+        hint=(
+            'Задайте общий для процессов бэкенд в CACHE_BACKEND, '
+            'например FileBasedCache или Memcached.'
+        ),
+        id='api.W001',
+    )]
+
+
+@register(Tags.caches)
+def check_collection_cache(app_configs, **kwargs):
+    if cache_is_shared():
+        return []
+    return [Warning(
+        'Кэш по умолчанию виден только своему процессу, поэтому '
+        'изменения из других процессов меняют ETag и кэш ответов '
+        'только после истечения COLLECTION_VERSION_TIMEOUT.',
+        hint=(
+            'Задайте общий для процессов бэкенд в CACHE_BACKEND, '
+            'например FileBasedCache или Memcached.'
+        ),
+        id='api.W002',
+    )]
@@ -0,0 +1,55 @@
+import json
+
+from reviews.models import Title
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_title_chunks(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Перебирает произведения порциями по возрастанию 'id'.
+    Каждая порция - один запрос произведений и один запрос жанров,
+    поэтому расход памяти не зависит от размера каталога.
+    """
+    genres_through = Title.genre.through
+    last_id = 0
+    while True:
+        chunk = list(
+            Title.objects.filter(id__gt=last_id).order_by('id').values(
+                'id', 'name', 'year', 'description', 'category__slug',
+                'score_sum', 'reviews_count',
+            )[:chunk_size]
+        )
+        if not chunk:
+            return
+        last_id = chunk[-1]['id']
+        genres = {}
+        for title_id, slug in genres_through.objects.filter(
+            title_id__in=[title['id'] for title in chunk],
+        ).order_by('genre__slug').values_list('title_id', 'genre__slug'):
+            genres.setdefault(title_id, []).append(slug)
+        yield [
+            {
+                'id': title['id'],
+                'name': title['name'],
+                'year': title['year'],
+                'description': title['description'],
+                'category': title['category__slug'],
+                'genre': genres.get(title['id'], []),
+                'rating': (
+                    int(title['score_sum'] / title['reviews_count'])
+                    if title['reviews_count'] else None
+                ),
+                'reviews_count': title['reviews_count'],
+            }
+            for title in chunk
+        ]
+
+
+def iter_titles_ndjson(chunk_size=EXPORT_CHUNK_SIZE):
+    """Каталог произведений в формате NDJSON: одна строка на объект."""
+
+    for chunk in iter_title_chunks(chunk_size):
+        yield ''.join(
+            json.dumps(title, ensure_ascii=False) + '\n' for title in chunk
+        )
@@ -1,6 +1,13 @@
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
 from django_filters import rest_framework
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
 
 from reviews.models import Title
+from reviews.search import (
+    TITLE_SEARCH_TABLE, build_match_query, is_search_available, rank_sql,
+)
 
 
 class TitleFilter(rest_framework.FilterSet):
@@ -14,3 +21,83 @@ class TitleFilter(rest_framework.FilterSet):
     class Meta:
         model = Title
         fields = ('name', 'year', 'genre', 'category')
+
+
+# Поля группировки для фасетов списка произведений:
+# первое поле - значение фасета, остальные выводятся рядом с ним.
+TITLE_FACETS = {
+    'genre': ('genre__slug', 'genre__name'),
+    'category': ('category__slug', 'category__name'),
+    'year': ('year',),
+}
+
+
+def parse_title_facets(value):
+    """Разбирает параметр 'facets' вида 'genre,category,year'."""
+
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = sorted(set(names) - set(TITLE_FACETS))
+    if unknown:
+        raise ValidationError({'facets': (
+            f'Неизвестные фасеты: {", ".join(unknown)}. '
+            f'Доступны: {", ".join(TITLE_FACETS)}.'
+        )})
+    return list(dict.fromkeys(names))
+
+
+def count_title_facets(queryset, names):
+    """
+    Считает количество произведений для каждого значения фасетов
+    одним сгруппированным запросом на фасет.
+    """
+
+    title_ids = queryset.order_by().values('id')
+    facets = {}
+    for name in names:
+        value_field, *extra_fields = TITLE_FACETS[name]
+        rows = Title.objects.filter(
+            id__in=title_ids,
+            **{f'{value_field}__isnull': False},
+        ).values(
+            value_field, *extra_fields,
+        ).annotate(
+            count=Count('id', distinct=True),
+        ).order_by('-count', value_field)
+        facets[name] = [
+            {
+                field.rsplit('__', 1)[-1]: value
+                for field, value in row.items()
+            }
+            for row in rows
+        ]
+    return facets
+
+
+class TitleSearchFilter(filters.SearchFilter):
+    """
+    Поиск произведений по параметру 'search' через индекс FTS5:
+    слова ищутся по префиксу в названии и описании,
+    результаты сортируются по релевантности.
+    На других СУБД используется стандартный поиск по 'search_fields'.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not is_search_available():
+            return super().filter_queryset(request, queryset, view)
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        match = build_match_query(terms)
+        if not match:
+            return queryset.none()
+        table = Title._meta.db_table
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {TITLE_SEARCH_TABLE} '
+            f'WHERE {TITLE_SEARCH_TABLE} MATCH %s',
+            (match,),
+        )).annotate(search_rank=RawSQL(
+            f'SELECT {rank_sql()} FROM {TITLE_SEARCH_TABLE} '
+            f'WHERE {TITLE_SEARCH_TABLE} MATCH %s '
+            f'AND rowid = "{table}"."id"',
+            (match,),
+        )).order_by('search_rank', 'id')
@@ -0,0 +1,29 @@
+"""Обработчики фоновых задач, меняющих данные, видимые через API."""
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .cache import cache_is_shared, touch_on_commit
+from reviews.jobs import register_job
+from reviews.utils import reconcile_counters
+
+
+class SharedCacheRequired(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = (
+        'Фоновые задачи требуют общего для процессов кэша: иначе '
+        'версии коллекций, обновленные воркером, не увидят веб-процессы.'
+    )
+
+
+def require_shared_cache():
+    """Воркер меняет версии коллекций только в общем кэше."""
+
+    if not cache_is_shared():
+        raise SharedCacheRequired
+
+
+@register_job('reconcile_counters', atomic=False)
+def reconcile(chunk_size=1000):
+    reconcile_counters(chunk_size)
+    touch_on_commit('titles', 'reviews')
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from api.export import EXPORT_CHUNK_SIZE, iter_titles_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Выгружает каталог произведений с рейтингом в формате NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', '-o',
+            help='Файл для выгрузки, по умолчанию стандартный вывод.',
+        )
+        parser.add_argument(
+            '--chunk-size', default=EXPORT_CHUNK_SIZE, type=int,
+            help='Количество произведений в одном запросе к базе.',
+        )
+
+    def handle(self, *args, **options):
+        chunks = iter_titles_ndjson(options['chunk_size'])
+        if not options['output']:
+            for lines in chunks:
+                self.stdout.write(lines, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            output.writelines(chunks)
@@ -0,0 +1,178 @@
+import csv
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.utils.dateparse import parse_datetime
+
+from api.cache import touch_collections
+from reviews.models import Category, Comments, Genre, Review, Title, User
+from reviews.utils import (
+    refresh_review_comment_counts, refresh_title_histograms,
+    refresh_title_ratings,
+)
+
+
+def user_row(row):
+    return User(
+        id=row['id'],
+        username=row['username'],
+        email=row['email'],
+        role=row['role'],
+        bio=row['bio'],
+        first_name=row['first_name'],
+        last_name=row['last_name'],
+        password=make_password(None),
+    )
+
+
+def category_row(row):
+    return Category(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def genre_row(row):
+    return Genre(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def title_row(row):
+    return Title(
+        id=row['id'],
+        name=row['name'],
+        year=row['year'],
+        description=row.get('description', ''),
+        category_id=row['category'] or None,
+    )
+
+
+def genre_title_row(row):
+    return Title.genre.through(
+        id=row['id'], title_id=row['title_id'], genre_id=row['genre_id'],
+    )
+
+
+def review_row(row):
+    return Review(
+        id=row['id'],
+        title_id=row['title_id'],
+        text=row['text'],
+        author_id=row['author'],
+        score=row['score'],
+        pub_date=parse_datetime(row['pub_date']),
+    )
+
+
+def comment_row(row):
+    return Comments(
+        id=row['id'],
+        review_id=row['review_id'],
+        text=row['text'],
+        author_id=row['author'],
+        pub_date=parse_datetime(row['pub_date']),
+    )
+
+
+# Файлы в порядке зависимостей внешних ключей.
+IMPORTS = (
+    ('users.csv', User, user_row),
+    ('category.csv', Category, category_row),
+    ('genre.csv', Genre, genre_row),
+    ('titles.csv', Title, title_row),
+    ('genre_title.csv', Title.genre.through, genre_title_row),
+    ('review.csv', Review, review_row),
+    ('comments.csv', Comments, comment_row),
+)
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Сохраняет даты публикации из файла вместо текущего времени."""
+
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает данные из CSV-файлов в базу пакетными вставками. '
+        'Файлы читаются построчно, поэтому размер файла не ограничен '
+        'памятью.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=settings.BASE_DIR / 'static' / 'data',
+            type=Path,
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            default=2000,
+            type=int,
+            help='Количество строк в одном INSERT.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        missing = [
+            filename for filename, _, _ in IMPORTS
+            if not (path / filename).is_file()
+        ]
+        if missing:
+            raise CommandError(
+                f'В каталоге {path} нет файлов: {", ".join(missing)}'
+            )
+
+        started = time.monotonic()
+        total = 0
+        try:
+            with transaction.atomic():
+                for filename, model, make_object in IMPORTS:
+                    total += self.import_file(
+                        path / filename, model, make_object, batch_size,
+                    )
+                refresh_title_ratings()
+                refresh_title_histograms()
+                refresh_review_comment_counts()
+        except (IntegrityError, KeyError, ValueError) as error:
+            raise CommandError(f'Загрузка прервана: {error}')
+        touch_collections(
+            'users', 'categories', 'genres', 'titles', 'reviews', 'comments',
+        )
+        self.report('Всего', total, time.monotonic() - started)
+
+    def import_file(self, filename, model, make_object, batch_size):
+        started = time.monotonic()
+        count = 0
+        with open(filename, encoding='utf-8', newline='') as file:
+            objects = map(make_object, csv.DictReader(file))
+            with keep_auto_now_add(model):
+                while True:
+                    batch = list(islice(objects, batch_size))
+                    if not batch:
+                        break
+                    model.objects.bulk_create(batch)
+                    count += len(batch)
+        self.report(filename.name, count, time.monotonic() - started)
+        return count
+
+    def report(self, name, count, elapsed):
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(
+            f'{name}: {count} строк за {elapsed:.2f} с ({rate:.0f} строк/с)'
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import touch_collections
+from reviews.models import Review, Title
+from reviews.utils import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счетчики отзывов, оценок и комментариев по данным '
+        'в базе. Каждая порция обрабатывается в отдельной транзакции.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            default=1000,
+            type=int,
+            help='Количество объектов в одной порции.',
+        )
+
+    def handle(self, *args, **options):
+        counts = reconcile_counters(options['chunk_size'])
+        touch_collections('titles', 'reviews')
+        for name, model in (('Произведения', Title), ('Отзывы', Review)):
+            self.stdout.write(f'{name}: пересчитано {counts[model]}')
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import get_response_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Выводит попадания и промахи кэша ответов API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'basenames', nargs='*', default=['titles'],
+            help='Имена вьюсетов в роутере, по умолчанию titles.',
+        )
+
+    def handle(self, *args, **options):
+        for basename in options['basenames']:
+            stats = get_response_cache_stats(basename)
+            self.stdout.write(
+                f'{basename}: попаданий {stats["hits"]}, '
+                f'промахов {stats["misses"]}, '
+                f'доля попаданий {stats["hit_rate"]:.1%}'
+            )
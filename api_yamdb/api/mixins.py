@@ -0,0 +1,206 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException, PermissionDenied
+from rest_framework.response import Response
+
+from .cache import get_collection_state, touch_on_commit
+from .moderation import raw_delete
+from .permissions import AuthorOrModeratorOrAdminPermission
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = ''
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы для вьюсетов.
+    ETag и Last-Modified вычисляются по версиям коллекций
+    из атрибута 'cache_collections', поэтому при совпадении
+    If-None-Match или If-Modified-Since ответ 304 отдается
+    до выполнения основного запроса к базе данных.
+    """
+
+    cache_collections = ()
+
+    def get_validators(self, request):
+        states = [
+            get_collection_state(name) for name in self.cache_collections
+        ]
+        source = '|'.join(
+            [version for version, _ in states]
+            + [request.build_absolute_uri(), request.accepted_media_type]
+        )
+        etag = quote_etag(hashlib.md5(source.encode('utf-8')).hexdigest())
+        last_modified = int(max(modified for _, modified in states))
+        return etag, last_modified
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [value.strip() for value in if_none_match.split(',')]
+            return '*' in tags or etag in [
+                tag[2:] if tag.startswith('W/') else tag for tag in tags
+            ]
+        if_modified_since = parse_http_date_safe(
+            request.headers.get('If-Modified-Since', ''),
+        )
+        return (
+            if_modified_since is not None
+            and last_modified <= if_modified_since
+        )
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_validators = None
+        if request.method in ('GET', 'HEAD') and self.cache_collections:
+            self.conditional_validators = self.get_validators(request)
+            if self.is_not_modified(request, *self.conditional_validators):
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs,
+        )
+        validators = getattr(self, 'conditional_validators', None)
+        if validators and response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED,
+        ):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class NestedResourceMixin:
+    """
+    Разрешение родительских объектов вложенного маршрута.
+    'parent_chain' перечисляет родителей от внешнего к внутреннему
+    как (имя, модель, параметр URL). Вся цепочка загружается одним
+    запросом с JOIN по ближайшему родителю и проверкой остальных ключей,
+    а результат хранится до конца запроса. Несогласованные
+    идентификаторы в URL дают 404.
+    """
+
+    parent_chain = ()
+
+    def get_parent_paths(self):
+        """Пути от ближайшего родителя к каждому из внешних."""
+
+        names = [name for name, _, _ in self.parent_chain]
+        return {
+            names[index]: '__'.join(reversed(names[index:-1]))
+            for index in range(len(names) - 1)
+        }
+
+    def load_parents(self):
+        *_, (name, model, url_kwarg) = self.parent_chain
+        paths = self.get_parent_paths()
+        lookups = {'pk': self.kwargs[url_kwarg]}
+        for outer_name, outer_model, outer_kwarg in self.parent_chain[:-1]:
+            lookups[f'{paths[outer_name]}__pk'] = self.kwargs[outer_kwarg]
+        nearest = get_object_or_404(
+            model.objects.select_related(*paths.values()), **lookups,
+        )
+
+        parents = {name: nearest}
+        for outer_name, path in paths.items():
+            parent = nearest
+            for attribute in path.split('__'):
+                parent = getattr(parent, attribute)
+            parents[outer_name] = parent
+        return parents
+
+    def get_parent(self, name):
+        if getattr(self, '_parents', None) is None:
+            self._parents = self.load_parents()
+        return self._parents[name]
+
+
+class ConditionalWriteMixin:
+    """
+    Изменение и удаление объекта вложенного маршрута одним условным
+    UPDATE/DELETE без загрузки объекта и родителей. Условие WHERE
+    проверяет идентификаторы из URL и права автора, модератора или
+    администратора. Если строка не изменилась, проверяется ее
+    существование: 404, если объекта нет, иначе 403.
+    Быстрый путь используют PATCH только полей 'fast_update_fields'
+    и DELETE при 'fast_delete'; остальные запросы идут обычным путем.
+    Сигналы моделей не срабатывают, поэтому версии коллекций
+    'write_collections' обновляются здесь. Используется вместе
+    с NestedResourceMixin.
+    """
+
+    fast_update_fields = ()
+    fast_delete = False
+    write_collections = ()
+
+    def get_route_queryset(self):
+        *outer, (name, _, url_kwarg) = self.parent_chain
+        paths = self.get_parent_paths()
+        lookups = {
+            'pk': self.kwargs[self.lookup_url_kwarg or self.lookup_field],
+            f'{name}__pk': self.kwargs[url_kwarg],
+        }
+        for outer_name, _, outer_kwarg in outer:
+            lookups[f'{name}__{paths[outer_name]}__pk'] = (
+                self.kwargs[outer_kwarg]
+            )
+        model = self.get_serializer_class().Meta.model
+        try:
+            return model.objects.filter(**lookups)
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+
+    def get_writable_queryset(self):
+        return self.get_route_queryset().filter(
+            AuthorOrModeratorOrAdminPermission.writable_filter(self.request),
+        )
+
+    def raise_missing_or_forbidden(self):
+        if self.get_route_queryset().exists():
+            raise PermissionDenied()
+        raise Http404
+
+    def is_fast_update(self, request):
+        fields = set(request.data) if hasattr(request.data, 'keys') else ()
+        return bool(fields) and fields <= set(self.fast_update_fields)
+
+    def partial_update(self, request, *args, **kwargs):
+        if not self.is_fast_update(request):
+            return super().partial_update(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        changes = {
+            field: serializer.validated_data[field] for field in request.data
+        }
+        if not self.get_writable_queryset().update(**changes):
+            self.raise_missing_or_forbidden()
+        touch_on_commit(*self.write_collections)
+        instance = self.get_route_queryset().get()
+        return Response(self.get_serializer(instance).data)
+
+    def destroy(self, request, *args, **kwargs):
+        if not self.fast_delete:
+            return super().destroy(request, *args, **kwargs)
+        with transaction.atomic():
+            if not raw_delete(self.get_writable_queryset()):
+                self.raise_missing_or_forbidden()
+            self.perform_fast_destroy()
+            touch_on_commit(*self.write_collections)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_fast_destroy(self):
+        """Обновляет агрегаты, которые поддерживали сигналы удаления."""
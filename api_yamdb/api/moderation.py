@@ -0,0 +1,68 @@
+from django.db import transaction
+
+from .cache import touch_on_commit
+from reviews.models import Comments, Review
+from reviews.utils import (
+    refresh_review_comment_counts, refresh_title_aggregates,
+)
+
+
+def raw_delete(queryset):
+    """
+    Удаляет строки одним DELETE без загрузки объектов и сигналов.
+    Агрегаты и версии коллекций вызывающий код обновляет сам.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def moderation_report(ids, deleted_ids, **extra):
+    deleted = set(deleted_ids)
+    return {
+        'deleted': sorted(deleted),
+        'not_found': sorted(set(ids) - deleted),
+        **extra,
+    }
+
+
+def delete_reviews(ids):
+    """
+    Удаляет отзывы вместе с комментариями к ним и пересчитывает
+    агрегаты каждого затронутого произведения по одному разу
+    в той же транзакции, до обновления версий коллекций.
+    """
+    with transaction.atomic():
+        found = dict(
+            Review.objects.select_for_update().filter(pk__in=ids).values_list(
+                'id', 'title_id',
+            )
+        )
+        if not found:
+            return moderation_report(ids, (), comments_deleted=0)
+        comments_deleted = raw_delete(
+            Comments.objects.filter(review_id__in=found),
+        )
+        raw_delete(Review.objects.filter(pk__in=found))
+        refresh_title_aggregates(set(found.values()))
+        touch_on_commit('titles', 'reviews', 'comments')
+    return moderation_report(
+        ids, found, comments_deleted=comments_deleted,
+    )
+
+
+def delete_comments(ids):
+    """
+    Удаляет комментарии и пересчитывает счетчики затронутых отзывов
+    одним UPDATE.
+    """
+    with transaction.atomic():
+        found = dict(
+            Comments.objects.select_for_update().filter(
+                pk__in=ids,
+            ).values_list('id', 'review_id')
+        )
+        if not found:
+            return moderation_report(ids, ())
+        raw_delete(Comments.objects.filter(pk__in=found))
+        refresh_review_comment_counts(set(found.values()))
+        touch_on_commit('reviews', 'comments')
+    return moderation_report(ids, found)
@@ -0,0 +1,216 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.template import loader
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination, PageNumberPagination, _positive_int, remove_query_param,
+    replace_query_param,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация по полям 'cursor_ordering' вьюсета.
+    Курсор хранит значения всех полей сортировки последнего объекта,
+    поэтому страница выбирается условием WHERE без OFFSET и COUNT,
+    а последнее поле сортировки служит уникальным разделителем.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Некорректный курсор.'
+    template = 'rest_framework/pagination/previous_and_next.html'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(view.cursor_ordering)
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip('-'))
+            for name in self.ordering
+        ]
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self.reverse_field(name) for name in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(
+                ordering, position,
+            ))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous = position is not None
+            self.has_next = has_more
+
+        self.display_page_controls = self.has_previous or self.has_next
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    @staticmethod
+    def reverse_field(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    def get_keyset_filter(self, ordering, position):
+        """Условие 'строго после позиции' для составного ключа сортировки."""
+
+        keyset_filter = Q()
+        for index, name in enumerate(ordering):
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition = Q(**{f'{name.lstrip("-")}__{lookup}': position[index]})
+            for previous in range(index):
+                condition &= Q(**{
+                    ordering[previous].lstrip('-'): position[previous],
+                })
+            keyset_filter |= condition
+        return keyset_filter
+
+    def get_position(self, instance):
+        return [
+            field.value_to_string(instance) for field in self.fields
+        ]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            if len(cursor['p']) != len(self.fields):
+                raise ValueError
+            position = [
+                field.to_python(value)
+                for field, value in zip(self.fields, cursor['p'])
+            ]
+            reverse = bool(cursor.get('r'))
+        except (
+            TypeError, ValueError, KeyError, UnicodeError,
+            DjangoValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = {'p': position}
+        if reverse:
+            cursor['r'] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(cursor, separators=(',', ':')).encode('utf-8'),
+        ).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded,
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_html_context(self):
+        return {
+            'previous_url': self.get_previous_link(),
+            'next_url': self.get_next_link(),
+        }
+
+    def to_html(self):
+        template = loader.get_template(self.template)
+        return template.render(self.get_html_context())
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с курсорным режимом по запросу.
+    Курсорный режим включается параметром '?pagination=cursor'
+    (или переданным курсором) для вьюсетов с атрибутом 'cursor_ordering'.
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = KeysetPagination
+
+    cursor_paginator = None
+
+    def is_cursor_mode(self, request, view):
+        if not getattr(view, 'cursor_ordering', None):
+            return False
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param in params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_mode(request, view):
+            self.cursor_paginator = self.cursor_pagination_class()
+            page = self.cursor_paginator.paginate_queryset(
+                queryset, request, view,
+            )
+            self.display_page_controls = (
+                self.cursor_paginator.display_page_controls
+            )
+            return page
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
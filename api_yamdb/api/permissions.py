@@ -1,3 +1,4 @@
+from django.db.models import Q
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 
 from reviews.constants import ADMIN, MODERATOR
@@ -20,12 +21,22 @@ class AuthorOrModeratorOrAdminPermission(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         return (
-            obj.author == request.user
+            obj.author_id == request.user.pk
             or request.method in SAFE_METHODS
             or request.user.role == MODERATOR
             or request.user.role == ADMIN
         )
 
+    @staticmethod
+    def writable_filter(request):
+        """
+        Условие на строки, которые пользователь может изменять,
+        для запросов без загрузки объекта.
+        """
+        if request.user.role in (MODERATOR, ADMIN):
+            return Q()
+        return Q(author_id=request.user.pk)
+
 
 class AdminUserPermission(BasePermission):
     """
@@ -48,3 +59,14 @@ class AdminOnlyPermission(BasePermission):
         if request.user.is_authenticated:
             return request.user.is_staff or request.user.role == ADMIN
         return False
+
+
+class ModeratorOrAdminPermission(BasePermission):
+    """Кастомный пермишен, разрешающий доступ модератору и администратору."""
+
+    def has_permission(self, request, view):
+        if request.user.is_authenticated:
+            return request.user.is_staff or request.user.role in (
+                MODERATOR, ADMIN,
+            )
+        return False
@@ -1,10 +1,14 @@
 import datetime as dt
 
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import models
 from rest_framework import serializers
 
+from .user_cache import user_cache
 from reviews.constants import MAX_LENGTH_EMAIL, MAX_LENGTH_USERNAME
-from reviews.models import Category, Comments, Genre, Review, Title, User
+from reviews.models import (
+    Category, Comments, Genre, Job, Review, Title, TitleScoreHistogram, User,
+)
 
 
 class AdminSerializer(serializers.ModelSerializer):
@@ -45,6 +49,16 @@ class GetTokenSerializer(serializers.ModelSerializer):
         fields = ('username', 'confirmation_code')
 
 
+class ModerationSerializer(serializers.Serializer):
+    """Сериализатор списка объектов для пакетной модерации."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+
+
 class CategoriesSerializer(serializers.ModelSerializer):
     """Сериализатор для категорий."""
 
@@ -71,7 +85,7 @@ class TitlesReadSerializer(serializers.ModelSerializer):
     class Meta:
         model = Title
         fields = (
-            'id', 'name', 'year', 'rating',
+            'id', 'name', 'year', 'rating', 'reviews_count',
             'description', 'genre', 'category',
         )
 
@@ -95,10 +109,60 @@ class TitlesWriteSerializer(TitlesReadSerializer):
     )
 
 
+class TitlesBulkSerializer(TitlesReadSerializer):
+    """
+    Сериализатор элемента пакетной загрузки произведений.
+    Слаги категории и жанров только проверяются на формат,
+    объекты по ним находятся сразу для всего пакета.
+    """
+
+    id = serializers.IntegerField(required=False)
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+
+class ScoreHistogramSerializer(serializers.ModelSerializer):
+    """Сериализатор распределения оценок произведения."""
+
+    scores = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True,
+    )
+    count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TitleScoreHistogram
+        fields = ('title', 'count', 'scores')
+
+    def get_count(self, obj):
+        return sum(obj.scores.values())
+
+
+class AuthorField(serializers.SlugRelatedField):
+    """
+    Имя автора из кэша снимков пользователей: связанный объект
+    не загружается, нужен только 'author_id'.
+    """
+
+    def get_attribute(self, instance):
+        return instance.author_id
+
+    def to_representation(self, value):
+        return user_cache.get(value).username
+
+
+class AuthorListSerializer(serializers.ListSerializer):
+    """Загружает снимки авторов всех элементов одним запросом."""
+
+    def to_representation(self, data):
+        items = data.all() if isinstance(data, models.Manager) else data
+        user_cache.get_many(item.author_id for item in items)
+        return super().to_representation(items)
+
+
 class ReviewsSerializer(serializers.ModelSerializer):
     """Сериализатор для отзывов."""
 
-    author = serializers.SlugRelatedField(
+    author = AuthorField(
         read_only=True,
         slug_field='username',
         default=serializers.CurrentUserDefault(),
@@ -106,7 +170,27 @@ class ReviewsSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count',
+        )
+        list_serializer_class = AuthorListSerializer
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        embedded = getattr(instance, 'embedded_comments', None)
+        if embedded is not None:
+            data['comments'] = CommentSerializer(embedded, many=True).data
+        return data
+
+
+class LatestReviewSerializer(ReviewsSerializer):
+    """Сериализатор ленты последних отзывов."""
+
+    title_name = serializers.CharField(source='title.name', read_only=True)
+
+    class Meta(ReviewsSerializer.Meta):
+        fields = (*ReviewsSerializer.Meta.fields, 'title', 'title_name')
+        read_only_fields = fields
 
 
 class CommentSerializer(ReviewsSerializer):
@@ -115,3 +199,16 @@ class CommentSerializer(ReviewsSerializer):
     class Meta:
         model = Comments
         exclude = ('review',)
+        list_serializer_class = AuthorListSerializer
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Сериализатор фоновой задачи."""
+
+    class Meta:
+        model = Job
+        fields = (
+            'id', 'name', 'key', 'payload', 'status', 'attempts',
+            'max_attempts', 'run_after', 'locked_by', 'last_error',
+            'created_at', 'finished_at',
+        )
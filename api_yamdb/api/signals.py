@@ -0,0 +1,47 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import store_token_version
+from api.cache import touch_on_commit
+from api.user_cache import user_cache
+from reviews.models import Category, Comments, Genre, Review, Title, User
+
+# Коллекции, версии которых меняются при изменении моделей.
+MODEL_COLLECTIONS = {
+    Title: ('titles',),
+    Review: ('reviews',),
+    Comments: ('comments',),
+    User: ('users',),
+    Genre: ('genres',),
+    Category: ('categories',),
+}
+
+
+def model_changed(sender, **kwargs):
+    """Обновляет версии коллекций после фиксации транзакции."""
+
+    touch_on_commit(*MODEL_COLLECTIONS[sender])
+
+
+for model in MODEL_COLLECTIONS:
+    post_save.connect(model_changed, sender=model)
+    post_delete.connect(model_changed, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        touch_on_commit('titles')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, created=False, **kwargs):
+    """Обновляет версию токенов и сбрасывает снимок пользователя."""
+
+    if not created:
+        transaction.on_commit(partial(store_token_version, instance.pk))
+    transaction.on_commit(partial(user_cache.invalidate, instance.pk))
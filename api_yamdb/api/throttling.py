@@ -0,0 +1,139 @@
+"""Ограничение частоты запросов к регистрации и выдаче токена."""
+import hashlib
+
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Ограничение по алгоритму token bucket. Частота 'N/период' задает
+    емкость корзины N и скорость ее пополнения N жетонов за период,
+    поэтому допускаются короткие всплески до N запросов. Состояние
+    корзины хранится в кэше Django одной записью и работает с любым
+    бэкендом; при одновременных запросах возможна небольшая погрешность.
+    """
+
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def allow_request(self, request, view):
+        allowed = self.peek(request, view)
+        if allowed:
+            self.consume()
+        return allowed
+
+    def peek(self, request, view):
+        """Проверяет, есть ли в корзине жетон, не забирая его."""
+
+        self.key = None
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        tokens, updated = self.cache.get(self.key, (self.num_requests, None))
+        if updated is not None:
+            tokens = min(
+                self.num_requests,
+                tokens + (self.now - updated) * self.refill_rate,
+            )
+        self.tokens = tokens
+        return tokens >= 1
+
+    def consume(self):
+        """Забирает жетон, наличие которого проверил 'peek'."""
+
+        if self.key is None:
+            return
+        self.tokens -= 1
+        self.cache.set(self.key, (self.tokens, self.now), self.duration)
+
+    @property
+    def refill_rate(self):
+        return self.num_requests / self.duration
+
+    def wait(self):
+        return (1 - self.tokens) / self.refill_rate
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """Запросы с одного IP-адреса."""
+
+    scope = 'auth-ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request),
+        }
+
+
+class AuthFieldThrottle(TokenBucketThrottle):
+    """Запросы с одним значением поля 'field' в теле запроса."""
+
+    field = None
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        value = data.get(self.field) if hasattr(data, 'get') else None
+        if not isinstance(value, str) or not value.strip():
+            return None
+        ident = hashlib.md5(
+            value.strip().lower().encode('utf-8'),
+        ).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class AuthEmailThrottle(AuthFieldThrottle):
+    scope = 'auth-email'
+    field = 'email'
+
+
+class AuthUsernameThrottle(AuthFieldThrottle):
+    scope = 'auth-username'
+    field = 'username'
+
+
+class AuthGlobalThrottle(TokenBucketThrottle):
+    """Общий предел для всех запросов к эндпоинту."""
+
+    scope = 'auth-global'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': 'all'}
+
+
+class AllBucketsThrottle(BaseThrottle):
+    """
+    Пропускает запрос, только если жетон есть во всех корзинах
+    'throttle_classes', и лишь тогда забирает по жетону из каждой.
+    Иначе отклоненные запросы одного клиента опустошали бы общую
+    корзину и блокировали всех остальных.
+    """
+
+    throttle_classes = ()
+
+    def allow_request(self, request, view):
+        throttles = [throttle() for throttle in self.throttle_classes]
+        self.denied = [
+            throttle for throttle in throttles
+            if not throttle.peek(request, view)
+        ]
+        if self.denied:
+            return False
+        for throttle in throttles:
+            throttle.consume()
+        return True
+
+    def wait(self):
+        return max(throttle.wait() for throttle in self.denied)
+
+
+class AuthThrottle(AllBucketsThrottle):
+    throttle_classes = (
+        AuthIPThrottle, AuthEmailThrottle, AuthUsernameThrottle,
+        AuthGlobalThrottle,
+    )
+
+
+AUTH_THROTTLES = (AuthThrottle,)
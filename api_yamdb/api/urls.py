@@ -2,9 +2,10 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
-    CategoriesViewSet, CommentsViewSet, GenresViewSet,
-    ReviewsViewSet, TitlesViewSet, UserViewSet,
-    category_delete, genre_delete, signup, token,
+    CategoriesViewSet, CommentsViewSet, GenresViewSet, JobViewSet,
+    LatestReviewsViewSet, ReviewsViewSet, TitlesViewSet, UserViewSet,
+    category_delete, genre_delete, moderate_comments, moderate_reviews,
+    signup, token,
 )
 
 
@@ -14,6 +15,10 @@ router.register('users', UserViewSet, basename='users')
 router.register('categories', CategoriesViewSet, basename='categories')
 router.register('genres', GenresViewSet, basename='genres')
 router.register('titles', TitlesViewSet, basename='titles')
+router.register('jobs', JobViewSet, basename='jobs')
+router.register(
+    'reviews/latest', LatestReviewsViewSet, basename='latest-reviews'
+)
 router.register(
     r'^titles/(?P<title_id>\d+)/reviews', ReviewsViewSet, basename='reviews'
 )
@@ -29,6 +34,8 @@ url_auth = [
 urlpatterns = [
     path('v1/genres/<slug:slug>/', genre_delete),
     path('v1/categories/<slug:slug>/', category_delete),
+    path('v1/moderation/reviews/', moderate_reviews),
+    path('v1/moderation/comments/', moderate_comments),
     path('v1/', include(url_auth)),
     path('v1/', include(router.urls)),
 ]
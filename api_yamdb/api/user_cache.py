@@ -0,0 +1,130 @@
+"""Кэш снимков пользователей в памяти процесса."""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.db import router
+
+from reviews.models import User
+
+SNAPSHOT_FIELDS = (
+    'id', 'username', 'role', 'is_staff', 'is_active', 'token_version',
+)
+
+
+class UserSnapshot(namedtuple('UserSnapshot', SNAPSHOT_FIELDS)):
+    """Поля пользователя, нужные для аутентификации и имени автора."""
+
+    __slots__ = ()
+
+    @property
+    def pk(self):
+        return self.id
+
+    def to_user(self):
+        """
+        Пользователь с полями снимка без запроса к базе.
+        Остальные поля загружаются при первом обращении к ним.
+        """
+        values = self._asdict()
+        # 'from_db' ждет значения в порядке полей модели.
+        fields = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            router.db_for_read(User),
+            fields,
+            [values[name] for name in fields],
+        )
+
+
+class UserSnapshotCache:
+    """
+    LRU-кэш снимков пользователей с ограниченным размером и временем
+    жизни записей. Записи сбрасываются сигналами изменения пользователя,
+    время жизни ограничивает устаревание в других процессах.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        # Растет при каждом сбросе: снимки, загруженные до сброса,
+        # могут быть устаревшими и в кэш не попадают.
+        self._generation = 0
+
+    def get_many(self, user_ids):
+        """
+        Снимки пользователей по id; отсутствующие в кэше загружаются
+        одним запросом. Пользователей, которых нет в базе, нет в ответе.
+        """
+        found, missing = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for user_id in dict.fromkeys(user_ids):
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(user_id)
+                    found[user_id] = entry[0]
+                else:
+                    missing.append(user_id)
+            self.hits += len(found)
+            self.misses += len(missing)
+            generation = self._generation
+        if missing:
+            loaded = [
+                UserSnapshot(*row) for row in User.objects.filter(
+                    pk__in=missing,
+                ).values_list(*SNAPSHOT_FIELDS)
+            ]
+            self.set_many(loaded, generation)
+            found.update((snapshot.id, snapshot) for snapshot in loaded)
+        return found
+
+    def get(self, user_id):
+        return self.get_many([user_id]).get(user_id)
+
+    def set_many(self, snapshots, generation=None):
+        expires = time.monotonic() + self.timeout
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            for snapshot in snapshots:
+                self._entries[snapshot.id] = (snapshot, expires)
+                self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+user_cache = UserSnapshotCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    timeout=settings.USER_CACHE_TIMEOUT,
+)
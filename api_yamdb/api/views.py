@@ -1,29 +1,50 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, permissions, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework import filters, mixins, permissions, status, viewsets
+from rest_framework.decorators import (
+    action, api_view, authentication_classes, permission_classes,
+    throttle_classes,
+)
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
-from .filters import TitleFilter
+from .authentication import ClaimsAccessToken
+from .bulk import TitlesBulkSaver
+from .cache import cache_response
+from .export import iter_titles_ndjson
+from .filters import (
+    TitleFilter, TitleSearchFilter, count_title_facets, parse_title_facets,
+)
+from .jobs import require_shared_cache
+from .mixins import (
+    ConditionalGetMixin, ConditionalWriteMixin, NestedResourceMixin,
+)
+from .moderation import delete_comments, delete_reviews
+from .pagination import KeysetPagination
 from .permissions import (
     AdminOnlyPermission, AdminUserPermission,
-    AuthorOrModeratorOrAdminPermission,
+    AuthorOrModeratorOrAdminPermission, ModeratorOrAdminPermission,
 )
 from .serializers import (
     AdminSerializer, AuthSerializer,
     CategoriesSerializer, CommentSerializer,
-    GenreSerializer, GetTokenSerializer,
-    ReviewsSerializer, TitlesReadSerializer,
-    TitlesWriteSerializer, UserSerializer,
+    GenreSerializer, GetTokenSerializer, JobSerializer, LatestReviewSerializer,
+    ModerationSerializer, ReviewsSerializer, ScoreHistogramSerializer,
+    TitlesReadSerializer, TitlesWriteSerializer, UserSerializer,
+)
+from .throttling import AUTH_THROTTLES
+from .user_cache import user_cache
+from reviews.jobs import enqueue
+from reviews.models import (
+    Category, Genre, Job, Review, Title, TitleScoreHistogram, User,
 )
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.outbox import queue_mail
+from reviews.utils import latest_comments
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -55,37 +76,50 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.save(role=request.user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(methods=['GET'], detail=False, url_path='cache-stats')
+    def cache_stats(self, request):
+        """Попадания и промахи кэша пользователей этого процесса."""
+
+        return Response(user_cache.stats())
+
 
 @api_view(['POST'])
+@authentication_classes(())
 @permission_classes([permissions.AllowAny])
+@throttle_classes(AUTH_THROTTLES)
 def signup(request):
     """Вью-функция для регистрации."""
 
     serializer = AuthSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    try:
-        user, created = User.objects.get_or_create(
-            email=serializer.validated_data['email'],
-            username=serializer.validated_data['username'],
-        )
-    except IntegrityError:
-        raise ValidationError('Указанный email или username уже существует!')
+    with transaction.atomic():
+        try:
+            user, created = User.objects.get_or_create(
+                email=serializer.validated_data['email'],
+                username=serializer.validated_data['username'],
+            )
+        except IntegrityError:
+            raise ValidationError(
+                'Указанный email или username уже существует!'
+            )
 
-    if user.username == 'me':
-        return Response(status=status.HTTP_400_BAD_REQUEST)
-    else:
+        if user.username == 'me':
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        # Письмо отправит команда send_outbox после фиксации транзакции.
         confirmation_code = default_token_generator.make_token(user)
-        send_mail(
+        queue_mail(
             subject='Код для входа',
             message=f'Код для входа {confirmation_code}',
             from_email=settings.EMAIL_HOST_USER,
             recipient_list=[user.email],
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
+@authentication_classes(())
 @permission_classes([permissions.AllowAny])
+@throttle_classes(AUTH_THROTTLES)
 def token(request):
     """Вью-функция для работы с токеном."""
 
@@ -101,10 +135,50 @@ def token(request):
     ):
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
-    return Response({'token': str(AccessToken.for_user(user))})
+    return Response({'token': str(ClaimsAccessToken.for_user(user))})
+
+
+@api_view(['POST'])
+@permission_classes((ModeratorOrAdminPermission,))
+def moderate_reviews(request):
+    """Вью-функция для пакетного удаления отзывов модератором."""
+
+    serializer = ModerationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    return Response(delete_reviews(serializer.validated_data['ids']))
+
+
+@api_view(['POST'])
+@permission_classes((ModeratorOrAdminPermission,))
+def moderate_comments(request):
+    """Вью-функция для пакетного удаления комментариев модератором."""
+
+    serializer = ModerationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    return Response(delete_comments(serializer.validated_data['ids']))
 
 
-class GenresViewSet(viewsets.ModelViewSet):
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Вьюсет состояния фоновых задач для администратора."""
+
+    queryset = Job.objects.order_by('-id')
+    serializer_class = JobSerializer
+    permission_classes = (AdminOnlyPermission,)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_fields = ('name', 'status')
+
+    @action(methods=['POST'], detail=False, url_path='reconcile-counters')
+    def reconcile_counters(self, request):
+        """Ставит в очередь пересчет всех счетчиков."""
+
+        require_shared_cache()
+        job = enqueue('reconcile_counters', key='reconcile_counters')
+        return Response(
+            JobSerializer(job).data, status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class GenresViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Вьюсет для жанров."""
 
     queryset = Genre.objects.all().order_by('id')
@@ -112,6 +186,7 @@ class GenresViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     permission_classes = (AdminUserPermission,)
+    cache_collections = ('genres',)
 
 
 class CategoriesViewSet(GenresViewSet):
@@ -119,6 +194,7 @@ class CategoriesViewSet(GenresViewSet):
 
     queryset = Category.objects.all().order_by('id')
     serializer_class = CategoriesSerializer
+    cache_collections = ('categories',)
 
 
 @api_view(['DELETE'])
@@ -139,65 +215,237 @@ def category_delete(request, slug):
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class TitlesViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Вьюсет для произведений."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score'),
-    ).prefetch_related(
-        'reviews',
+    queryset = Title.objects.prefetch_related(
         'genre',
     ).select_related(
         'category',
     ).order_by('id')
-    filter_backends = (filters.SearchFilter, DjangoFilterBackend,)
+    filter_backends = (TitleSearchFilter, DjangoFilterBackend,)
     filterset_class = TitleFilter
     search_fields = ('name',)
     permission_classes = (AdminUserPermission,)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cursor_ordering = ('id',)
+    facets_query_param = 'facets'
+    cache_collections = ('titles', 'reviews', 'genres', 'categories')
+    bulk_max_items = 5000
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitlesReadSerializer
         return TitlesWriteSerializer
 
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        facets = parse_title_facets(
+            request.query_params.get(self.facets_query_param, ''),
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        if facets:
+            response.data['facets'] = count_title_facets(queryset, facets)
+        return response
+
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(
+        methods=['GET'],
+        detail=False,
+        permission_classes=(AdminOnlyPermission,),
+    )
+    def export(self, request):
+        """Потоковая выгрузка всего каталога в формате NDJSON."""
+
+        response = StreamingHttpResponse(
+            iter_titles_ndjson(), content_type='application/x-ndjson',
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="titles.ndjson"'
+        )
+        return response
+
+    @action(methods=['GET'], detail=True, url_path='score-histogram')
+    def score_histogram(self, request, pk=None):
+        """Распределение оценок произведения по значениям от 1 до 10."""
+
+        title = get_object_or_404(
+            Title.objects.select_related('score_histogram'), pk=pk,
+        )
+        try:
+            histogram = title.score_histogram
+        except TitleScoreHistogram.DoesNotExist:
+            histogram = TitleScoreHistogram(title=title)
+        return Response(ScoreHistogramSerializer(histogram).data)
+
+    @action(methods=['POST', 'PATCH'], detail=False, url_path='bulk')
+    def bulk(self, request):
+        """
+        Пакетное создание (POST) и изменение (PATCH) произведений.
+        Принимает список произведений, в PATCH каждый элемент
+        содержит 'id'. Возвращает сохраненные произведения
+        и ошибки по индексам элементов.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError('Ожидается непустой список произведений.')
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                f'За один запрос можно передать не более '
+                f'{self.bulk_max_items} произведений.'
+            )
+
+        saver = TitlesBulkSaver(items, partial=request.method == 'PATCH')
+        saver.save()
+        errors = saver.get_errors()
+        if not saver.saved_ids:
+            return Response(
+                {'results': [], 'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        titles = self.get_queryset().in_bulk(saver.saved_ids)
+        serializer = TitlesReadSerializer(
+            [titles[title_id] for title_id in saver.saved_ids], many=True,
+        )
+        return Response(
+            {'results': serializer.data, 'errors': errors},
+            status=(
+                status.HTTP_201_CREATED if request.method == 'POST'
+                else status.HTTP_200_OK
+            ),
+        )
 
-class ReviewsViewSet(viewsets.ModelViewSet):
-    """Вьюсет для отзывов."""
+
+class ReviewsViewSet(
+    NestedResourceMixin, ConditionalGetMixin, ConditionalWriteMixin,
+    viewsets.ModelViewSet,
+):
+    """
+    Вьюсет для отзывов.
+    Одним UPDATE изменяется только текст: смена оценки и удаление
+    обновляют агрегаты произведения в сигналах и идут обычным путем.
+    """
 
     serializer_class = ReviewsSerializer
     permission_classes = (AuthorOrModeratorOrAdminPermission,)
     http_method_names = ['get', 'post', 'delete', 'patch']
+    cursor_ordering = ('id',)
+    cache_collections = ('titles', 'reviews', 'comments', 'users')
+    parent_chain = (('title', Title, 'title_id'),)
+    embed_comments_query_param = 'embed_comments'
+    embed_comments_max = 20
+    fast_update_fields = ('text',)
+    write_collections = ('reviews',)
 
     def get_queryset(self):
-        title_id = self.kwargs['title_id']
-        title = get_object_or_404(Title, pk=title_id)
-        return title.reviews.all().order_by('id')
+        return self.get_parent('title').reviews.order_by('id')
+
+    def get_embed_comments_limit(self):
+        value = self.request.query_params.get(
+            self.embed_comments_query_param,
+        )
+        if value is None:
+            return 0
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = -1
+        if not 0 <= limit <= self.embed_comments_max:
+            raise ValidationError({
+                self.embed_comments_query_param: (
+                    f'Ожидается число от 0 до {self.embed_comments_max}.'
+                ),
+            })
+        return limit
+
+    def paginate_queryset(self, queryset):
+        """
+        Добавляет к отзывам страницы их последние комментарии.
+        Авторы отзывов и комментариев загружаются в кэш одним запросом.
+        """
+
+        page = super().paginate_queryset(queryset)
+        limit = self.get_embed_comments_limit()
+        if page is not None and limit:
+            comments = {review.pk: [] for review in page}
+            authors = [review.author_id for review in page]
+            for comment in latest_comments(comments, limit):
+                comments[comment.review_id].append(comment)
+                authors.append(comment.author_id)
+            for review in page:
+                review.embedded_comments = comments[review.pk]
+            user_cache.get_many(authors)
+        return page
 
     def perform_create(self, serializer):
-        title_id = self.kwargs['title_id']
-        title = get_object_or_404(Title, pk=title_id)
         try:
-            serializer.save(author=self.request.user, title=title)
+            serializer.save(
+                author=self.request.user, title=self.get_parent('title'),
+            )
         except IntegrityError:
             raise ValidationError(
                 'Вы уже оставляли отзыв на это произведение.'
             )
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class LatestReviewsViewSet(
+    ConditionalGetMixin, mixins.ListModelMixin, viewsets.GenericViewSet,
+):
+    """
+    Лента последних отзывов по всем произведениям.
+    Всегда отдается курсорными страницами по индексу даты публикации.
+    """
+
+    queryset = Review.objects.select_related('title').only(
+        'id', 'text', 'score', 'pub_date', 'comments_count', 'author',
+        'title__name',
+    )
+    serializer_class = LatestReviewSerializer
+    permission_classes = (AuthorOrModeratorOrAdminPermission,)
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-pub_date', '-id')
+    cache_collections = ('titles', 'reviews', 'users')
+
+
+class CommentsViewSet(
+    NestedResourceMixin, ConditionalGetMixin, ConditionalWriteMixin,
+    viewsets.ModelViewSet,
+):
     """Вьюсет для комментариев."""
 
     serializer_class = CommentSerializer
     permission_classes = (AuthorOrModeratorOrAdminPermission,)
     http_method_names = ['get', 'post', 'delete', 'patch']
+    cursor_ordering = ('pub_date', 'id')
+    cache_collections = ('titles', 'reviews', 'comments', 'users')
+    parent_chain = (
+        ('title', Title, 'title_id'),
+        ('review', Review, 'review_id'),
+    )
+    fast_update_fields = ('text',)
+    fast_delete = True
+    write_collections = ('reviews', 'comments')
 
     def get_queryset(self):
-        review_id = self.kwargs['review_id']
-        review = get_object_or_404(Review, pk=review_id)
-        return review.comments.all().order_by('pub_date')
+        return self.get_parent('review').comments.order_by('pub_date', 'id')
+
+    def perform_fast_destroy(self):
+        Review.objects.filter(pk=self.kwargs['review_id']).update(
+            comments_count=F('comments_count') - 1,
+        )
 
     def perform_create(self, serializer):
-        review_id = self.kwargs['review_id']
-        review = get_object_or_404(Review, pk=review_id)
-        return serializer.save(author=self.request.user, review=review)
+        return serializer.save(
+            author=self.request.user, review=self.get_parent('review'),
+        )
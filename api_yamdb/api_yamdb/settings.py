@@ -66,6 +66,45 @@ DATABASES = {
     }
 }
 
+# Профили соединений SQLite, выбираются переменной SQLITE_PROFILE.
+# В 'production' читатели и писатель не блокируют друг друга (WAL),
+# а писатели ждут друг друга до 'busy_timeout' миллисекунд.
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        # Ожидание блокировки задается первым: оно нужно уже для
+        # переключения журнала при параллельных подключениях.
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+    },
+}
+SQLITE_PRAGMAS = SQLITE_PROFILES[os.getenv('SQLITE_PROFILE', 'default')]
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
+    }
+}
+
+# Время жизни закэшированных ответов API, секунды
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Время жизни версий коллекций в кэше процесса, секунды: за это время
+# изменения из других процессов становятся видны в ETag и кэше ответов
+COLLECTION_VERSION_TIMEOUT = 30
+
+# Кэш снимков пользователей в памяти процесса: число записей
+# и время их жизни в секундах
+USER_CACHE_MAX_SIZE = 10000
+USER_CACHE_TIMEOUT = 300
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -106,10 +145,17 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageNumberOrCursorPagination',
     'PAGE_SIZE': 5,
+    # Корзины регистрации и выдачи токена: емкость и пополнение за период
+    'DEFAULT_THROTTLE_RATES': {
+        'auth-ip': '30/min',
+        'auth-email': '10/min',
+        'auth-username': '10/min',
+        'auth-global': '600/min',
+    },
 }
 
 SIMPLE_JWT = {
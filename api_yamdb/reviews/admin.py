@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.models import (
+    Category, EmailOutbox, Genre, Job, Review, Title, User,
+)
 
 
 @admin.register(Title)
@@ -37,3 +39,15 @@ class UserAdmin(admin.ModelAdmin):
     )
     search_fields = ('username', 'role')
     list_filter = ('username',)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key', 'status', 'attempts', 'run_after')
+    list_filter = ('status', 'name')
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
@@ -18,6 +18,11 @@ MAX_LENGTH_USERNAME = 150
 # Максимальная длина role
 MAX_LENGTH_ROLE = 9
 
+# Допустимые оценки отзыва
+MIN_SCORE = 1
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
 # Пользователи
 ADMIN = 'admin'
 MODERATOR = 'moderator'
@@ -29,3 +34,32 @@ ROLE_CHOICE = (
     (MODERATOR, MODERATOR),
     (ADMIN, ADMIN),
 )
+
+# Статусы фоновых задач
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+JOB_STATUS_CHOICE = (
+    (JOB_PENDING, JOB_PENDING),
+    (JOB_RUNNING, JOB_RUNNING),
+    (JOB_DONE, JOB_DONE),
+    (JOB_FAILED, JOB_FAILED),
+)
+
+# Максимальная длина статуса, имени и ключа задачи
+MAX_LENGTH_JOB_STATUS = 10
+MAX_LENGTH_JOB_NAME = 100
+MAX_LENGTH_JOB_KEY = 255
+
+# Статусы писем в очереди отправки
+MAIL_PENDING = 'pending'
+MAIL_SENT = 'sent'
+MAIL_FAILED = 'failed'
+
+MAIL_STATUS_CHOICE = (
+    (MAIL_PENDING, MAIL_PENDING),
+    (MAIL_SENT, MAIL_SENT),
+    (MAIL_FAILED, MAIL_FAILED),
+)
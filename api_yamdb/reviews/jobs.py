@@ -0,0 +1,149 @@
+"""Очередь фоновых задач на таблице 'Job' без внешнего брокера."""
+
+import traceback
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.constants import JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_RUNNING
+from reviews.models import Job
+
+JOB_HANDLERS = {}
+# Задачи, обработчики которых сами управляют транзакциями.
+NON_ATOMIC_JOBS = set()
+
+# Задержка перед повторной попыткой: 2, 4, 8... секунд, не больше часа.
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 3600
+
+
+def register_job(name, atomic=True):
+    """
+    Регистрирует функцию как обработчик задач с именем 'name'.
+    С 'atomic=False' обработчик выполняется вне общей транзакции:
+    так длинные задачи фиксируют работу порциями и не держат
+    блокировку записи до своего завершения.
+    """
+
+    def decorator(handler):
+        JOB_HANDLERS[name] = handler
+        if atomic:
+            NON_ATOMIC_JOBS.discard(name)
+        else:
+            NON_ATOMIC_JOBS.add(name)
+        return handler
+
+    return decorator
+
+
+def enqueue(name, payload=None, key=None, **options):
+    """
+    Ставит задачу в очередь в текущей транзакции.
+    Если ожидающая задача с тем же ключом уже есть, возвращается она.
+    """
+    if name not in JOB_HANDLERS:
+        raise ValueError(f'Неизвестный обработчик задачи: {name}')
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=name, key=key, payload=payload or {}, **options,
+            )
+    except IntegrityError:
+        if key is None:
+            raise
+        return Job.objects.get(key=key, status=JOB_PENDING)
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=min(RETRY_BASE_DELAY ** attempts, RETRY_MAX_DELAY),
+    )
+
+
+def claim_job(worker):
+    """
+    Забирает самую раннюю готовую к запуску задачу.
+    Задачу получает тот воркер, чей условный UPDATE изменил строку.
+    """
+    while True:
+        now = timezone.now()
+        job_id = Job.objects.filter(
+            status=JOB_PENDING, run_after__lte=now,
+        ).order_by('run_after', 'id').values_list('id', flat=True).first()
+        if job_id is None:
+            return None
+        claimed = Job.objects.filter(pk=job_id, status=JOB_PENDING).update(
+            status=JOB_RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+
+
+def release_stale_jobs(timeout):
+    """
+    Возвращает в очередь задачи воркеров, не завершивших их вовремя.
+    Задачи, ключ которых уже занят новой ожидающей задачей, закрываются:
+    ту же работу выполнит новая задача.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=JOB_RUNNING, locked_at__lt=now - timeout,
+    )
+    pending_keys = Job.objects.filter(
+        status=JOB_PENDING, key__isnull=False,
+    ).values('key')
+    stale.filter(key__in=pending_keys).update(
+        status=JOB_DONE, finished_at=now,
+    )
+    return stale.update(status=JOB_PENDING, locked_by='', locked_at=None)
+
+
+def run_job(job):
+    """
+    Выполняет задачу в транзакции, если обработчик не управляет
+    ими сам, и сохраняет результат.
+    При ошибке задача откладывается с экспоненциальной задержкой,
+    после 'max_attempts' попыток она помечается как 'failed'.
+    """
+    handler = JOB_HANDLERS.get(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f'Неизвестный обработчик задачи: {job.name}')
+        if job.name in NON_ATOMIC_JOBS:
+            context = nullcontext()
+        else:
+            context = transaction.atomic()
+        with context:
+            handler(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if handler is None or job.attempts >= job.max_attempts:
+            job.status = JOB_FAILED
+            job.finished_at = timezone.now()
+        else:
+            job.status = JOB_PENDING
+            job.run_after = timezone.now() + retry_delay(job.attempts)
+        job.locked_by, job.locked_at = '', None
+    else:
+        job.status = JOB_DONE
+        job.finished_at = timezone.now()
+    # Пока задача выполнялась, ее ключ могла занять новая задача:
+    # повтор не нужен, ту же работу выполнит она.
+    if job.status == JOB_PENDING and job.key is not None:
+        duplicate = Job.objects.filter(
+            key=job.key, status=JOB_PENDING,
+        ).exclude(pk=job.pk)
+        if duplicate.exists():
+            job.status = JOB_DONE
+            job.finished_at = timezone.now()
+    job.save(update_fields=(
+        'status', 'run_after', 'locked_by', 'locked_at', 'last_error',
+        'finished_at',
+    ))
+    return job
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.search import is_search_available, rebuild_title_search
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс произведений.'
+
+    def handle(self, *args, **options):
+        if not is_search_available():
+            raise CommandError(
+                'Полнотекстовый индекс поддерживается только для SQLite.'
+            )
+        rebuild_title_search()
+        self.stdout.write(self.style.SUCCESS('Индекс произведений обновлен.'))
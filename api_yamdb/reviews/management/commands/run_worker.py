@@ -0,0 +1,58 @@
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from reviews.jobs import claim_job, release_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из таблицы задач. Несколько воркеров '
+        'могут работать параллельно: задачу забирает ровно один из них.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+        parser.add_argument(
+            '--sleep',
+            default=1.0,
+            type=float,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--stale-after',
+            default=600,
+            type=int,
+            help='Через сколько секунд вернуть в очередь зависшую задачу.',
+        )
+        parser.add_argument(
+            '--worker-id',
+            default=f'{socket.gethostname()}:{os.getpid()}',
+            help='Имя воркера в поле locked_by.',
+        )
+
+    def handle(self, *args, **options):
+        worker = options['worker_id']
+        stale_after = timedelta(seconds=options['stale_after'])
+        try:
+            while True:
+                release_stale_jobs(stale_after)
+                job = claim_job(worker)
+                if job is None:
+                    if options['once']:
+                        return
+                    time.sleep(options['sleep'])
+                    continue
+                job = run_job(job)
+                self.stdout.write(
+                    f'{job}: попытка {job.attempts}/{job.max_attempts}'
+                )
+        except KeyboardInterrupt:
+            self.stdout.write('Воркер остановлен.')
@@ -0,0 +1,60 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import deliver_message, next_outbox_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди порциями через одно соединение '
+        'с почтовым сервером. Запускается одним процессом.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=100,
+            type=int,
+            help='Количество писем, выбираемых из очереди за раз.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а ждать новых писем.',
+        )
+        parser.add_argument(
+            '--sleep',
+            default=5.0,
+            type=float,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        connection = get_connection()
+        try:
+            while True:
+                batch = next_outbox_batch(options['batch_size'])
+                if not batch:
+                    if not options['loop']:
+                        break
+                    connection.close()
+                    time.sleep(options['sleep'])
+                    continue
+                try:
+                    connection.open()
+                except Exception as error:
+                    # Письма будут отложены при попытке отправки.
+                    self.stderr.write(f'Нет соединения с сервером: {error}')
+                for message in batch:
+                    if deliver_message(message, connection):
+                        sent += 1
+                    else:
+                        failed += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+        self.stdout.write(f'Отправлено писем: {sent}, с ошибкой: {failed}')
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:10
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_title_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    aggregates = Review.objects.values('title').annotate(
+        total=Sum('score'), count=Count('id'),
+    ).order_by()
+    for row in aggregates:
+        Title.objects.filter(pk=row['title']).update(
+            score_sum=row['total'], reviews_count=row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_rating, migrations.RunPython.noop),
+    ]
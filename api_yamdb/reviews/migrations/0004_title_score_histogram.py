@@ -0,0 +1,55 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:29
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_score_histograms(apps, schema_editor):
+    TitleScoreHistogram = apps.get_model('reviews', 'TitleScoreHistogram')
+    Review = apps.get_model('reviews', 'Review')
+    histograms = {}
+    rows = Review.objects.values('title', 'score').annotate(
+        count=Count('id'),
+    ).order_by()
+    for row in rows:
+        histogram = histograms.setdefault(
+            row['title'], TitleScoreHistogram(title_id=row['title']),
+        )
+        setattr(histogram, f'score_{row["score"]}', row['count'])
+    TitleScoreHistogram.objects.bulk_create(
+        histograms.values(), batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScoreHistogram',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_histogram', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='Оценка 1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='Оценка 2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='Оценка 3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='Оценка 4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='Оценка 5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='Оценка 6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='Оценка 7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='Оценка 8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='Оценка 9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='Оценка 10')),
+            ],
+            options={
+                'verbose_name': 'распределение оценок',
+                'verbose_name_plural': 'Распределения оценок',
+            },
+        ),
+        migrations.RunPython(
+            fill_score_histograms, migrations.RunPython.noop,
+        ),
+    ]
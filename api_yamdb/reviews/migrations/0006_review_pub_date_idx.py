@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_review_comments_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-pub_date', '-id'], name='review_pub_date_idx'),
+        ),
+    ]
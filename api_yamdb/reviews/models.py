@@ -1,14 +1,25 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from reviews.constants import (
+    JOB_PENDING,
+    JOB_STATUS_CHOICE,
+    MAIL_PENDING,
+    MAIL_STATUS_CHOICE,
     MAX_LENGTH_EMAIL,
+    MAX_LENGTH_JOB_KEY,
+    MAX_LENGTH_JOB_NAME,
+    MAX_LENGTH_JOB_STATUS,
     MAX_LENGTH_NAME,
     MAX_LENGTH_ROLE,
     MAX_LENGTH_SLUG,
     MAX_LENGTH_TEXT,
+    MAX_SCORE,
+    MIN_SCORE,
     ROLE_CHOICE,
+    SCORES,
     USER,
 )
 
@@ -33,6 +44,14 @@ class User(AbstractUser):
         choices=ROLE_CHOICE,
         default=USER,
     )
+    token_version = models.PositiveIntegerField(
+        'Версия токенов',
+        default=0,
+        editable=False,
+    )
+
+    # Поля, копии которых передаются в токене доступа.
+    TOKEN_CLAIM_FIELDS = ('username', 'role', 'is_staff', 'is_active')
 
     class Meta:
         ordering = ('username',)
@@ -42,6 +61,27 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = instance.get_token_claims()
+        return instance
+
+    def get_token_claims(self):
+        return {
+            name: self.__dict__.get(name) for name in self.TOKEN_CLAIM_FIELDS
+        }
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Обращение к отложенному полю загружает все отложенные поля
+        # одним запросом: так работает пользователь, собранный из токена.
+        if fields is not None:
+            fields = set(fields)
+            deferred = self.get_deferred_fields()
+            if fields & deferred:
+                fields |= deferred
+        super().refresh_from_db(using, fields)
+
 
 class Category(models.Model):
     """Модель категории."""
@@ -118,14 +158,35 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Жанр(ы) произведения',
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
+        indexes = (
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(fields=('name',), name='title_name_idx'),
+        )
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        """Средняя оценка по сохраненным сумме и количеству оценок."""
+        if not self.reviews_count:
+            return None
+        return self.score_sum / self.reviews_count
+
 
 class Review(models.Model):
     """Модель отзыва."""
@@ -139,8 +200,8 @@ class Review(models.Model):
         'Оценка',
         default=1,
         validators=[
-            MaxValueValidator(10),
-            MinValueValidator(1),
+            MaxValueValidator(MAX_SCORE),
+            MinValueValidator(MIN_SCORE),
         ],
         blank=True,
     )
@@ -155,15 +216,37 @@ class Review(models.Model):
         related_name='reviews',
         verbose_name='Произведение',
     )
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'отзыв'
         verbose_name_plural = 'Отзывы'
         unique_together = ('author', 'title')
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'), name='review_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return f'{self.author} про {self.title}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Агрегаты произведения обновляются в сигнале post_save,
+        # поэтому сохранение отзыва и пересчет идут в одной транзакции.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
 
 class Comments(models.Model):
     """Модель комментария."""
@@ -189,6 +272,204 @@ class Comments(models.Model):
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date'), name='comment_review_date_idx',
+            ),
+        )
 
     def __str__(self):
         return f'Комментарий {self.author} к {self.review}'
+
+    def save(self, *args, **kwargs):
+        # Счетчик комментариев отзыва обновляется в сигнале post_save.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class TitleScoreHistogram(models.Model):
+    """
+    Распределение оценок произведения: по счетчику на каждую оценку.
+    Счетчики обновляются сигналами отзывов, поле 'score_N' хранит
+    количество отзывов с оценкой N.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_histogram',
+        verbose_name='Произведение',
+    )
+
+    class Meta:
+        verbose_name = 'распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return f'Оценки произведения {self.title_id}'
+
+    @staticmethod
+    def score_field(score):
+        return f'score_{score}'
+
+    @property
+    def scores(self):
+        return {
+            str(score): getattr(self, self.score_field(score))
+            for score in SCORES
+        }
+
+
+for score in SCORES:
+    TitleScoreHistogram.add_to_class(
+        TitleScoreHistogram.score_field(score),
+        models.PositiveIntegerField(f'Оценка {score}', default=0),
+    )
+
+
+class Job(models.Model):
+    """
+    Фоновая задача пересчета производных данных.
+    Задачи выполняет команда run_worker, обработчики регистрируются
+    в 'reviews.jobs'. Среди ожидающих задач ключ уникален.
+    """
+
+    name = models.CharField(
+        'Обработчик',
+        max_length=MAX_LENGTH_JOB_NAME,
+    )
+    key = models.CharField(
+        'Ключ дедупликации',
+        max_length=MAX_LENGTH_JOB_KEY,
+        null=True,
+        blank=True,
+    )
+    payload = models.JSONField(
+        'Аргументы',
+        default=dict,
+        blank=True,
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=MAX_LENGTH_JOB_STATUS,
+        choices=JOB_STATUS_CHOICE,
+        default=JOB_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток',
+        default=0,
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток',
+        default=5,
+    )
+    run_after = models.DateTimeField(
+        'Не раньше',
+        default=timezone.now,
+    )
+    locked_by = models.CharField(
+        'Воркер',
+        max_length=MAX_LENGTH_JOB_KEY,
+        blank=True,
+    )
+    locked_at = models.DateTimeField(
+        'Взята в работу',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        'Создана',
+        auto_now_add=True,
+    )
+    finished_at = models.DateTimeField(
+        'Завершена',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        indexes = (
+            models.Index(
+                fields=('status', 'run_after'), name='job_queue_idx',
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('key',),
+                condition=models.Q(status=JOB_PENDING),
+                name='job_pending_key_uniq',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+
+class EmailOutbox(models.Model):
+    """
+    Письмо в очереди отправки.
+    Записывается в транзакции вместе с изменением данных,
+    а отправляет его команда send_outbox.
+    """
+
+    subject = models.CharField(
+        'Тема',
+        max_length=MAX_LENGTH_NAME,
+    )
+    body = models.TextField('Текст')
+    from_email = models.CharField(
+        'Отправитель',
+        max_length=MAX_LENGTH_EMAIL,
+        blank=True,
+    )
+    recipients = models.JSONField('Получатели')
+    status = models.CharField(
+        'Статус',
+        max_length=MAX_LENGTH_JOB_STATUS,
+        choices=MAIL_STATUS_CHOICE,
+        default=MAIL_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток',
+        default=0,
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток',
+        default=5,
+    )
+    send_after = models.DateTimeField(
+        'Не раньше',
+        default=timezone.now,
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        'Создано',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        'Отправлено',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'письмо'
+        verbose_name_plural = 'Очередь писем'
+        indexes = (
+            models.Index(
+                fields=('status', 'send_after'), name='outbox_queue_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.subject} для {", ".join(self.recipients)}'
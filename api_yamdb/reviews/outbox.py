@@ -0,0 +1,62 @@
+"""Очередь исходящих писем на таблице 'EmailOutbox'."""
+
+import traceback
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.utils import timezone
+
+from reviews.constants import MAIL_FAILED, MAIL_PENDING, MAIL_SENT
+from reviews.jobs import retry_delay
+from reviews.models import EmailOutbox
+
+
+def queue_mail(subject, message, recipient_list, from_email=None):
+    """
+    Аналог 'send_mail', который только ставит письмо в очередь.
+    Вызывается в транзакции, изменяющей данные, о которых письмо.
+    """
+    return EmailOutbox.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+
+def next_outbox_batch(batch_size):
+    return list(EmailOutbox.objects.filter(
+        status=MAIL_PENDING, send_after__lte=timezone.now(),
+    ).order_by('send_after', 'id')[:batch_size])
+
+
+def deliver_message(message, connection):
+    """
+    Отправляет письмо через открытое соединение и сохраняет результат.
+    Неудачная отправка откладывается с экспоненциальной задержкой,
+    после 'max_attempts' попыток письмо помечается как 'failed'.
+    """
+    message.attempts += 1
+    try:
+        EmailMessage(
+            subject=message.subject,
+            body=message.body,
+            from_email=message.from_email or None,
+            to=message.recipients,
+            connection=connection,
+        ).send()
+    except Exception:
+        message.last_error = traceback.format_exc()
+        if message.attempts >= message.max_attempts:
+            message.status = MAIL_FAILED
+        else:
+            message.send_after = (
+                timezone.now() + retry_delay(message.attempts)
+            )
+    else:
+        message.status = MAIL_SENT
+        message.sent_at = timezone.now()
+    message.save(update_fields=(
+        'status', 'attempts', 'send_after', 'last_error', 'sent_at',
+    ))
+    return message.status == MAIL_SENT
@@ -0,0 +1,43 @@
+"""Полнотекстовый поиск произведений на базе SQLite FTS5."""
+import re
+
+from django.db import connection
+
+# Индекс с внешним содержимым: тексты хранятся только в таблице
+# произведений, а синхронизацию выполняют триггеры из миграции 0003.
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+
+# Веса столбцов name и description для ранжирования bm25.
+TITLE_SEARCH_WEIGHTS = (10.0, 1.0)
+
+
+def is_search_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(terms):
+    """
+    Составляет запрос FTS5 из поисковых слов: каждое слово ищется
+    по префиксу, все слова должны встретиться в произведении.
+    """
+    phrases = [
+        '"{}"*'.format(term.replace('"', '""'))
+        for term in terms
+        if re.search(r'\w', term)
+    ]
+    return ' '.join(phrases)
+
+
+def rank_sql():
+    weights = ', '.join(str(weight) for weight in TITLE_SEARCH_WEIGHTS)
+    return f'bm25({TITLE_SEARCH_TABLE}, {weights})'
+
+
+def rebuild_title_search():
+    """Перестраивает индекс по текущему содержимому таблицы произведений."""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) '
+            "VALUES ('rebuild')"
+        )
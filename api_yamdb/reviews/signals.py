@@ -0,0 +1,99 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (
+    Comments, Review, Title, TitleScoreHistogram, User,
+)
+from reviews.utils import refresh_title_histograms, refresh_title_ratings
+
+
+def shift_score_histogram(title_id, added=None, removed=None):
+    """
+    Переносит отзыв между счетчиками распределения оценок.
+    Возвращает False, если строки распределения еще нет.
+    """
+    changes = {}
+    if added is not None:
+        field = TitleScoreHistogram.score_field(added)
+        changes[field] = F(field) + 1
+    if removed is not None:
+        field = TitleScoreHistogram.score_field(removed)
+        changes[field] = F(field) - 1
+    return bool(TitleScoreHistogram.objects.filter(
+        title_id=title_id,
+    ).update(**changes))
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Обновляет сумму, количество и распределение оценок произведения."""
+
+    if created:
+        Title.objects.filter(pk=instance.title_id).update(
+            score_sum=F('score_sum') + instance.score,
+            reviews_count=F('reviews_count') + 1,
+        )
+        if not shift_score_histogram(instance.title_id, added=instance.score):
+            refresh_title_histograms([instance.title_id])
+    else:
+        old_score = getattr(instance, '_loaded_score', None)
+        if old_score is None:
+            refresh_title_ratings([instance.title_id])
+            refresh_title_histograms([instance.title_id])
+        elif old_score != instance.score:
+            Title.objects.filter(pk=instance.title_id).update(
+                score_sum=F('score_sum') + instance.score - old_score,
+            )
+            if not shift_score_histogram(
+                instance.title_id, added=instance.score, removed=old_score,
+            ):
+                refresh_title_histograms([instance.title_id])
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Вычитает оценку удаленного отзыва из агрегатов произведения."""
+
+    Title.objects.filter(pk=instance.title_id).update(
+        score_sum=F('score_sum') - instance.score,
+        reviews_count=F('reviews_count') - 1,
+    )
+    # Строку распределения не создаем: при каскадном удалении
+    # произведения она уже удалена вместе с ним.
+    shift_score_histogram(instance.title_id, removed=instance.score)
+
+
+@receiver(post_save, sender=Comments)
+def comment_saved(sender, instance, created, **kwargs):
+    """Увеличивает счетчик комментариев отзыва."""
+
+    if created:
+        Review.objects.filter(pk=instance.review_id).update(
+            comments_count=F('comments_count') + 1,
+        )
+
+
+@receiver(post_delete, sender=Comments)
+def comment_deleted(sender, instance, **kwargs):
+    """Уменьшает счетчик комментариев отзыва."""
+
+    Review.objects.filter(pk=instance.review_id).update(
+        comments_count=F('comments_count') - 1,
+    )
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    """
+    Увеличивает версию токенов, если изменились поля, копии которых
+    переданы в токене: выданные ранее токены перестают им доверять.
+    """
+    claims = instance.get_token_claims()
+    if not created and getattr(instance, '_loaded_claims', None) != claims:
+        User.objects.filter(pk=instance.pk).update(
+            token_version=F('token_version') + 1,
+        )
+        instance.refresh_from_db(fields=('token_version',))
+    instance._loaded_claims = claims
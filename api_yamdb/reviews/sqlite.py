@@ -0,0 +1,23 @@
+"""Настройка соединений SQLite для профиля из настроек."""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    """Выполняет PRAGMA из словаря 'имя: значение' на курсоре DB-API."""
+
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Применяет PRAGMA профиля к каждому новому соединению SQLite."""
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor, pragmas)
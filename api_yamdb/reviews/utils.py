@@ -0,0 +1,169 @@
+from django.db import connection, transaction
+from django.db.models import (
+    Count, F, OuterRef, Subquery, Sum, Window,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, RowNumber
+
+from reviews.constants import SCORES
+from reviews.models import Comments, Review, Title, TitleScoreHistogram
+
+
+def refresh_title_ratings(title_ids=None):
+    """
+    Пересчитывает сумму и количество оценок произведений по отзывам
+    одним UPDATE. Без 'title_ids' пересчитываются все произведения.
+    """
+    reviews = Review.objects.filter(
+        title=OuterRef('pk'),
+    ).order_by().values('title')
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    return titles.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0,
+        ),
+    )
+
+
+def refresh_review_comment_counts(review_ids=None):
+    """
+    Пересчитывает количество комментариев отзывов одним UPDATE.
+    Без 'review_ids' пересчитываются все отзывы.
+    """
+    comments = Comments.objects.filter(
+        review=OuterRef('pk'),
+    ).order_by().values('review')
+    reviews = Review.objects.all()
+    if review_ids is not None:
+        reviews = reviews.filter(pk__in=review_ids)
+    return reviews.update(
+        comments_count=Coalesce(
+            Subquery(comments.annotate(total=Count('id')).values('total')),
+            0,
+        ),
+    )
+
+
+def latest_comments(review_ids, limit):
+    """
+    Последние 'limit' комментариев каждого из отзывов одним запросом.
+    Номера комментариев внутри отзыва считает оконная функция
+    ROW_NUMBER(), отбор по номеру выполняется во вложенном запросе.
+    """
+    ranked = Comments.objects.filter(review_id__in=review_ids).annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('review_id')],
+            order_by=[F('pub_date').desc(), F('id').desc()],
+        ),
+    ).values('id', 'position')
+    sql, params = ranked.query.sql_with_params()
+    return Comments.objects.filter(id__in=RawSQL(
+        f'SELECT id FROM ({sql}) AS ranked WHERE position <= %s',
+        (*params, limit),
+    )).order_by('review_id', '-pub_date', '-id')
+
+
+def refresh_title_histograms(title_ids=None):
+    """
+    Пересчитывает распределения оценок произведений по отзывам.
+    Недостающие строки создаются только для произведений с отзывами,
+    счетчики обновляются одним UPDATE.
+    """
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    missing = titles.filter(
+        reviews__isnull=False, score_histogram__isnull=True,
+    ).values_list('pk', flat=True).distinct()
+    TitleScoreHistogram.objects.bulk_create(
+        [TitleScoreHistogram(title_id=title_id) for title_id in missing],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    reviews = Review.objects.filter(
+        title=OuterRef('title'),
+    ).order_by().values('title')
+    histograms = TitleScoreHistogram.objects.all()
+    if title_ids is not None:
+        histograms = histograms.filter(title__in=title_ids)
+    return histograms.update(**{
+        TitleScoreHistogram.score_field(score): Coalesce(
+            Subquery(
+                reviews.filter(score=score).annotate(
+                    total=Count('id'),
+                ).values('total'),
+            ),
+            0,
+        )
+        for score in SCORES
+    })
+
+
+def bulk_create_with_ids(model, objects):
+    """
+    Пакетная вставка, после которой у объектов есть первичные ключи,
+    даже если СУБД не возвращает их из INSERT (SQLite в Django 3.2).
+    Вызывается первым запросом в транзакции: вставка сразу берет
+    блокировку записи с ожиданием busy_timeout, а не повышает ее
+    после чтения. Пока блокировка удерживается, новые строки - последние
+    по ключу, поэтому ключи назначаются в порядке вставки.
+    """
+    model.objects.bulk_create(objects)
+    if connection.features.can_return_rows_from_bulk_insert or not objects:
+        return objects
+    ids = list(model.objects.order_by('-pk').values_list(
+        'pk', flat=True,
+    )[:len(objects)])
+    for instance, pk in zip(objects, reversed(ids)):
+        instance.pk = pk
+    return objects
+
+
+def iter_id_chunks(model, chunk_size):
+    """Перебирает первичные ключи модели порциями по возрастанию."""
+
+    last_id = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_id).order_by('pk').values_list(
+                'pk', flat=True,
+            )[:chunk_size]
+        )
+        if not ids:
+            return
+        last_id = ids[-1]
+        yield ids
+
+
+def refresh_title_aggregates(title_ids=None):
+    """Пересчитывает рейтинг и распределение оценок произведений."""
+
+    refresh_title_ratings(title_ids)
+    refresh_title_histograms(title_ids)
+
+
+def reconcile_counters(chunk_size=1000):
+    """
+    Пересчитывает все счетчики порциями, каждую в своей транзакции.
+    Возвращает количество обработанных произведений и отзывов.
+    """
+    counts = {}
+    for model, refresh in (
+        (Title, refresh_title_aggregates),
+        (Review, refresh_review_comment_counts),
+    ):
+        counts[model] = 0
+        for ids in iter_id_chunks(model, chunk_size):
+            with transaction.atomic():
+                refresh(ids)
+            counts[model] += len(ids)
+    return counts
@@ -0,0 +1,27 @@
+import pytest
+from django.core.cache import cache
+
+from api.user_cache import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Очищает кэш, чтобы тесты не получали ответы друг друга."""
+
+    cache.clear()
+    user_cache.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Файловый кэш, общий для процессов, как в многопроцессном запуске."""
+
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        },
+    }
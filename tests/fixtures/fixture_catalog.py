@@ -0,0 +1,26 @@
+import pytest
+
+from reviews.models import Category, Comments, Genre, Review, Title
+
+
+@pytest.fixture
+def catalog(admin):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(
+        name='Терминатор', year=1984, description='', category=category
+    )
+    title.genre.add(genre)
+    review = Review.objects.create(
+        title=title, author=admin, text='Отзыв', score=7
+    )
+    comment = Comments.objects.create(
+        review=review, author=admin, text='Комментарий'
+    )
+    return {
+        'category': category,
+        'genre': genre,
+        'title': title,
+        'review': review,
+        'comment': comment,
+    }
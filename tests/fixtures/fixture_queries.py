@@ -0,0 +1,86 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Выполняет запрос и проверяет, что количество SQL-запросов
+    не превышает бюджет эндпоинта. Возвращает ответ и число запросов.
+    """
+
+    def check(endpoint, budget, request, *args, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = request(*args, **kwargs)
+        executed = len(context.captured_queries)
+        queries = '\n'.join(
+            f'{number}. {query["sql"]}'
+            for number, query in enumerate(context.captured_queries, 1)
+        )
+        assert executed <= budget, (
+            f'Запрос к эндпоинту `{endpoint}` выполнил {executed} '
+            f'SQL-запросов при бюджете {budget}:\n{queries}'
+        )
+        return response, executed
+
+    return check
+
+
+# Таблицы, полный просмотр которых считается ошибкой индексации.
+SCAN_CHECKED_TABLES = ('reviews_title', 'reviews_review', 'reviews_comments')
+TABLE_ALIAS_RE = re.compile(r'"(\w+)" (?:AS )?"?([A-Z]\d+)\b')
+FULL_SCAN_RE = re.compile(r'^SCAN (\w+)$')
+
+
+def find_full_scans(sql):
+    """
+    Полные просмотры таблиц в плане запроса SQLite.
+    Просмотр по индексу ('SCAN ... USING INDEX') полным не считается:
+    он идет в порядке сортировки и обрывается на LIMIT.
+    """
+    aliases = dict(
+        (alias, table) for table, alias in TABLE_ALIAS_RE.findall(sql)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        details = [row[-1] for row in cursor.fetchall()]
+    scans = []
+    for detail in details:
+        match = FULL_SCAN_RE.match(detail)
+        if match:
+            table = aliases.get(match.group(1), match.group(1))
+            if table in SCAN_CHECKED_TABLES:
+                scans.append(table)
+    return scans
+
+
+@pytest.fixture
+def query_plans():
+    """
+    Выполняет запрос и проверяет планы всех его SELECT-запросов:
+    полный просмотр таблиц произведений, отзывов и комментариев
+    допускается только для таблиц из 'allowed'.
+    """
+    if connection.vendor != 'sqlite':
+        pytest.skip('Планы запросов проверяются только для SQLite.')
+
+    def check(endpoint, request, *args, allowed=(), **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = request(*args, **kwargs)
+        problems = []
+        for query in context.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            scans = set(find_full_scans(query['sql'])) - set(allowed)
+            if scans:
+                problems.append(f'{", ".join(sorted(scans))}: {query["sql"]}')
+        assert not problems, (
+            f'Запрос к эндпоинту `{endpoint}` выполняет полный просмотр '
+            f'таблиц без индекса:\n' + '\n'.join(problems)
+        )
+        return response
+
+    return check
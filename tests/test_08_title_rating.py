@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_reviews(self, client, admin_client,
+                                       user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что рейтинг произведения без отзывов равен `None`.'
+        )
+
+        review = create_single_review(user_client, title_id, 'Текст', 4)
+        create_single_review(moderator_client, title_id, 'Текст', 9)
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что при создании отзыва пересчитывается рейтинг '
+            'произведения.'
+        )
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id']
+        )
+        response = user_client.patch(review_url, data={'score': 10})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что при изменении оценки отзыва пересчитывается '
+            'рейтинг произведения.'
+        )
+
+        response = user_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что при удалении отзыва пересчитывается рейтинг '
+            'произведения.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_02_rating_after_author_deleted(self, client, admin_client,
+                                            user_client, moderator_client,
+                                            user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Текст', 2)
+        create_single_review(moderator_client, title_id, 'Текст', 8)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 8, (
+            'Проверьте, что при каскадном удалении отзывов рейтинг '
+            'произведения пересчитывается.'
+        )
@@ -0,0 +1,201 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.user_cache import user_cache
+from reviews.models import Category, Comments, Genre, Review, Title
+
+# Бюджеты SQL-запросов для эндпоинтов из `api/urls.py`.
+# Запрос аутентификации по JWT тоже входит в бюджет. Бюджеты
+# рассчитаны на пустой кэш снимков пользователей: отзывы
+# и комментарии загружают имена авторов одним запросом.
+QUERY_BUDGETS = {
+    'users-list': 3,
+    'users-detail': 2,
+    'users-me': 1,
+    'signup': 6,
+    'token': 1,
+    'categories-list': 3,
+    'categories-delete': 6,
+    'genres-list': 3,
+    'genres-delete': 5,
+    'titles-list': 4,
+    'titles-detail': 3,
+    'reviews-list': 5,
+    'reviews-detail': 4,
+    'comments-list': 5,
+    'comments-detail': 4,
+}
+
+ENDPOINT_URLS = {
+    'users-list': '/api/v1/users/',
+    'categories-list': '/api/v1/categories/',
+    'genres-list': '/api/v1/genres/',
+    'titles-list': '/api/v1/titles/',
+    'reviews-list': '/api/v1/titles/{title_id}/reviews/',
+    'comments-list': (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    ),
+}
+
+
+def create_users(django_user_model, count, start=0):
+    return [
+        django_user_model.objects.create_user(
+            username=f'budget_user_{number}',
+            email=f'budget_user_{number}@yamdb.fake',
+        )
+        for number in range(start, start + count)
+    ]
+
+
+def create_page_objects(endpoint, authors, title, review):
+    """Создает по одному объекту эндпоинта на каждого автора."""
+
+    for number, author in enumerate(authors):
+        if endpoint == 'categories-list':
+            Category.objects.create(
+                name=f'Категория {author.id}', slug=f'category-{author.id}'
+            )
+        elif endpoint == 'genres-list':
+            Genre.objects.create(
+                name=f'Жанр {author.id}', slug=f'genre-{author.id}'
+            )
+        elif endpoint == 'titles-list':
+            extra = Title.objects.create(
+                name=f'Произведение {author.id}',
+                year=2000 + number,
+                description='Описание',
+                category=title.category,
+            )
+            extra.genre.set(title.genre.all())
+        elif endpoint == 'reviews-list':
+            Review.objects.create(
+                title=title, author=author, text='Текст', score=5
+            )
+        elif endpoint == 'comments-list':
+            Comments.objects.create(
+                review=review, author=author, text='Комментарий'
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryBudget:
+
+    @pytest.mark.parametrize('endpoint', (
+        'users-list', 'categories-list', 'genres-list', 'titles-list',
+        'reviews-list', 'comments-list',
+    ))
+    def test_01_list_budget(self, endpoint, admin_client, catalog,
+                            query_budget):
+        url = ENDPOINT_URLS[endpoint].format(
+            title_id=catalog['title'].id, review_id=catalog['review'].id
+        )
+        response, _ = query_budget(
+            endpoint, QUERY_BUDGETS[endpoint], admin_client.get, url
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_detail_budget(self, admin_client, admin, catalog,
+                              query_budget):
+        title = catalog['title']
+        review = catalog['review']
+        urls = {
+            'users-detail': f'/api/v1/users/{admin.username}/',
+            'users-me': '/api/v1/users/me/',
+            'titles-detail': f'/api/v1/titles/{title.id}/',
+            'reviews-detail': (
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+            ),
+            'comments-detail': (
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+                f'{catalog["comment"].id}/'
+            ),
+        }
+        for endpoint, url in urls.items():
+            response, _ = query_budget(
+                endpoint, QUERY_BUDGETS[endpoint], admin_client.get, url
+            )
+            assert response.status_code == HTTPStatus.OK
+
+    def test_03_delete_budget(self, admin_client, catalog, query_budget):
+        for endpoint, url in (
+            ('genres-delete', f'/api/v1/genres/{catalog["genre"].slug}/'),
+            (
+                'categories-delete',
+                f'/api/v1/categories/{catalog["category"].slug}/',
+            ),
+        ):
+            response, _ = query_budget(
+                endpoint, QUERY_BUDGETS[endpoint], admin_client.delete, url
+            )
+            assert response.status_code == HTTPStatus.NO_CONTENT
+
+    def test_04_auth_budget(self, client, query_budget, django_user_model):
+        data = {'email': 'budget@yamdb.fake', 'username': 'budget'}
+        response, _ = query_budget(
+            'signup', QUERY_BUDGETS['signup'],
+            client.post, '/api/v1/auth/signup/', data=data
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        data = {'username': 'budget', 'confirmation_code': 'wrong'}
+        response, _ = query_budget(
+            'token', QUERY_BUDGETS['token'],
+            client.post, '/api/v1/auth/token/', data=data
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.parametrize('endpoint', (
+        'users-list', 'categories-list', 'genres-list', 'titles-list',
+        'reviews-list', 'comments-list',
+    ))
+    def test_05_queries_do_not_grow_with_page(self, endpoint,
+                                              user_superuser_client,
+                                              catalog, query_budget,
+                                              django_user_model):
+        url = ENDPOINT_URLS[endpoint].format(
+            title_id=catalog['title'].id, review_id=catalog['review'].id
+        )
+        # Оба запроса выполняются с пустым кэшем пользователей, а автор
+        # объектов каталога не совпадает с пользователем запроса.
+        user_cache.clear()
+        _, single_item_queries = query_budget(
+            endpoint, QUERY_BUDGETS[endpoint], user_superuser_client.get, url
+        )
+
+        authors = create_users(django_user_model, 4)
+        create_page_objects(
+            endpoint, authors, catalog['title'], catalog['review']
+        )
+        user_cache.clear()
+        response, full_page_queries = query_budget(
+            endpoint, QUERY_BUDGETS[endpoint], user_superuser_client.get, url
+        )
+        assert len(response.json()['results']) == 5
+        assert full_page_queries == single_item_queries, (
+            f'Проверьте, что количество SQL-запросов к эндпоинту '
+            f'`{endpoint}` не зависит от размера страницы.'
+        )
+
+    @pytest.mark.parametrize('endpoint', ('reviews-list', 'comments-list'))
+    @pytest.mark.parametrize('pagination', ('', '&pagination=cursor'))
+    def test_06_large_page_authors(self, endpoint, pagination, admin,
+                                   admin_client, catalog, query_budget,
+                                   django_user_model):
+        url = ENDPOINT_URLS[endpoint].format(
+            title_id=catalog['title'].id, review_id=catalog['review'].id
+        )
+        authors = create_users(django_user_model, 99)
+        create_page_objects(
+            endpoint, authors, catalog['title'], catalog['review']
+        )
+        response, _ = query_budget(
+            endpoint, QUERY_BUDGETS[endpoint], admin_client.get,
+            f'{url}?page_size=100{pagination}'
+        )
+        results = response.json()['results']
+        assert len(results) == 100
+        assert {item['author'] for item in results} == {
+            admin.username, *(author.username for author in authors)
+        }
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Comments, Review, Title
+from tests.utils import walk_cursor_pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def test_01_titles_cursor(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        titles = [
+            Title.objects.create(
+                name=f'Произведение {number}', year=2000,
+                description='', category=category,
+            )
+            for number in range(12)
+        ]
+        ids = walk_cursor_pages(client, '/api/v1/titles/?pagination=cursor')
+        assert ids == [title.id for title in titles], (
+            'Проверьте, что курсорная пагинация произведений отдает все '
+            'объекты по возрастанию `id` без повторов.'
+        )
+
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == len(titles), (
+            'Проверьте, что постраничная пагинация остается режимом '
+            'по умолчанию.'
+        )
+
+    def test_02_reviews_and_comments_cursor(self, client, django_user_model):
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'cursor_{number}',
+                email=f'cursor_{number}@yamdb.fake',
+            )
+            for number in range(7)
+        ]
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Текст', score=5
+            )
+            for author in authors
+        ]
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        assert walk_cursor_pages(
+            client, f'{reviews_url}?pagination=cursor'
+        ) == [review.id for review in reviews]
+
+        comments = [
+            Comments.objects.create(
+                review=reviews[0], author=author, text='Комментарий'
+            )
+            for author in authors * 2
+        ]
+        Comments.objects.update(pub_date=comments[0].pub_date)
+        comments_url = f'{reviews_url}{reviews[0].id}/comments/'
+        assert walk_cursor_pages(
+            client, f'{comments_url}?pagination=cursor'
+        ) == [comment.id for comment in comments], (
+            'Проверьте, что курсорная пагинация комментариев не теряет '
+            'и не повторяет объекты с одинаковой датой публикации.'
+        )
+
+        response = client.get(f'{comments_url}?pagination=cursor')
+        previous_url = client.get(response.json()['next']).json()['previous']
+        first_page = client.get(previous_url).json()
+        assert [item['id'] for item in first_page['results']] == [
+            comment.id for comment in comments[:5]
+        ]
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос с некорректным курсором возвращает '
+            'ответ со статусом 404.'
+        )
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+
+
+def search(client, query):
+    response = client.get('/api/v1/titles/', {'search': query})
+    assert response.status_code == HTTPStatus.OK
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    def test_01_prefix_and_ranking(self, client):
+        Title.objects.create(
+            name='Сказка о рыбаке', year=1833, description='Про рыбку.'
+        )
+        Title.objects.create(
+            name='Крестный отец', year=1972, description='Сага о мафии.'
+        )
+        Title.objects.create(
+            name='Семья', year=2000, description='Крестный ход и отец.'
+        )
+
+        assert search(client, 'крест') == ['Крестный отец', 'Семья'], (
+            'Проверьте, что поиск находит произведения по префиксу слова '
+            'и выше ранжирует совпадения в названии.'
+        )
+        assert search(client, 'мафи сага') == ['Крестный отец'], (
+            'Проверьте, что поиск учитывает описание произведения и '
+            'требует совпадения всех слов.'
+        )
+        assert search(client, '"') == []
+
+    def test_02_index_follows_changes(self, client):
+        title = Title.objects.create(
+            name='Терминатор', year=1984, description=''
+        )
+        assert search(client, 'термин') == ['Терминатор']
+
+        title.name = 'Чужой'
+        title.save()
+        assert search(client, 'термин') == []
+        assert search(client, 'чуж') == ['Чужой'], (
+            'Проверьте, что индекс обновляется при изменении произведения.'
+        )
+
+        title.delete()
+        assert search(client, 'чуж') == [], (
+            'Проверьте, что индекс обновляется при удалении произведения.'
+        )
+
+    def test_03_rebuild_command(self, client):
+        Title.objects.create(name='Солярис', year=1972, description='')
+        call_command('rebuild_title_search')
+        assert search(client, 'солярис') == ['Солярис']
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def faceted_titles():
+    films = Category.objects.create(name='Фильм', slug='films')
+    books = Category.objects.create(name='Книга', slug='books')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    for name, year, category, genres in (
+        ('Первый', 1984, films, (drama, comedy)),
+        ('Второй', 1984, films, (drama,)),
+        ('Третий', 1990, books, (comedy,)),
+        ('Четвертый', 1990, None, ()),
+    ):
+        title = Title.objects.create(
+            name=name, year=year, description='', category=category
+        )
+        title.genre.set(genres)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleFacets:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_facets_counts(self, client, faceted_titles, query_budget):
+        response, _ = query_budget(
+            'titles-list-facets', 6, client.get, self.TITLES_URL,
+            {'facets': 'genre,category,year'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        facets = response.json()['facets']
+        assert facets['genre'] == [
+            {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+            {'slug': 'drama', 'name': 'Драма', 'count': 2},
+        ]
+        assert facets['category'] == [
+            {'slug': 'films', 'name': 'Фильм', 'count': 2},
+            {'slug': 'books', 'name': 'Книга', 'count': 1},
+        ]
+        assert facets['year'] == [
+            {'year': 1984, 'count': 2},
+            {'year': 1990, 'count': 2},
+        ]
+
+    def test_02_facets_follow_filter(self, client, faceted_titles):
+        response = client.get(
+            self.TITLES_URL, {'facets': 'genre,year', 'genre': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == 2
+        assert data['facets'] == {
+            'genre': [
+                {'slug': 'drama', 'name': 'Драма', 'count': 2},
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 1},
+            ],
+            'year': [{'year': 1984, 'count': 2}],
+        }, (
+            'Проверьте, что фасеты считаются по отфильтрованному списку '
+            'произведений.'
+        )
+
+    def test_03_facets_optional_and_validated(self, client, faceted_titles):
+        response = client.get(self.TITLES_URL)
+        assert 'facets' not in response.json()
+
+        response = client.get(self.TITLES_URL, {'facets': 'genre,author'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестного фасета возвращает ответ со '
+            'статусом 400.'
+        )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.cache import get_response_cache_stats
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_hit_and_invalidation(self, client, admin, query_budget):
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        category = Category.objects.create(name='Фильм', slug='films')
+        title = Title.objects.create(
+            name='Фильм', year=2000, description='', category=category
+        )
+        title.genre.add(genre)
+        detail_url = f'{self.TITLES_URL}{title.id}/'
+
+        assert self.get(client, self.TITLES_URL)['X-Cache'] == 'MISS'
+        response, _ = query_budget(
+            'titles-list-cached', 0, client.get, self.TITLES_URL
+        )
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный запрос списка произведений отдается '
+            'из кэша без обращения к базе данных.'
+        )
+        self.get(client, detail_url)
+
+        Review.objects.create(title=title, author=admin, text='', score=8)
+        response = self.get(client, detail_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что кэш произведений сбрасывается при создании '
+            'отзыва.'
+        )
+
+        genre.name = 'Трагедия'
+        genre.save()
+        response = self.get(client, self.TITLES_URL)
+        assert response.json()['results'][0]['genre'][0]['name'] == (
+            'Трагедия'
+        )
+
+        title.genre.clear()
+        assert self.get(client, detail_url).json()['genre'] == []
+
+        category.delete()
+        assert self.get(client, detail_url).json()['category'] is None
+
+    def test_02_query_string_in_key(self, client):
+        Title.objects.create(name='Первый', year=1990, description='')
+        Title.objects.create(name='Второй', year=2000, description='')
+
+        assert self.get(client, self.TITLES_URL).json()['count'] == 2
+        response = self.get(client, f'{self.TITLES_URL}?year=2000')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1
+
+    def test_03_stats(self, client):
+        self.get(client, self.TITLES_URL)
+        self.get(client, self.TITLES_URL)
+        self.get(client, self.TITLES_URL)
+        assert get_response_cache_stats('titles') == {
+            'hits': 2, 'misses': 1, 'hit_rate': 2 / 3,
+        }
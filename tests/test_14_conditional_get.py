@@ -0,0 +1,104 @@
+import time
+from http import HTTPStatus
+
+import pytest
+
+from api.checks import check_collection_cache
+from reviews.models import Comments, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    def test_01_etag_short_circuit(self, client, admin, query_budget):
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=5
+        )
+        Comments.objects.create(review=review, author=admin, text='Ок')
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title.id}/',
+            '/api/v1/genres/',
+            '/api/v1/categories/',
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            etag = response['ETag']
+            assert response['Last-Modified'], (
+                f'Проверьте, что ответ `{url}` содержит Last-Modified.'
+            )
+            response, _ = query_budget(
+                url, 0, client.get, url, HTTP_IF_NONE_MATCH=etag
+            )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                'If-None-Match возвращает ответ со статусом 304.'
+            )
+            assert response['ETag'] == etag
+            assert not response.content
+
+    def test_02_etag_changes_with_data(self, client, admin):
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(reviews_url)['ETag']
+
+        Review.objects.create(title=title, author=admin, text='', score=5)
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка отзывов меняется при добавлении '
+            'отзыва.'
+        )
+        assert response['ETag'] != etag
+
+        genres_etag = client.get('/api/v1/genres/')['ETag']
+        assert client.get(
+            '/api/v1/genres/?search=др', HTTP_IF_NONE_MATCH=genres_etag
+        ).status_code == HTTPStatus.OK
+        Genre.objects.create(name='Драма', slug='drama')
+        assert client.get(
+            '/api/v1/genres/', HTTP_IF_NONE_MATCH=genres_etag
+        ).status_code == HTTPStatus.OK
+
+    def test_03_if_modified_since(self, client):
+        response = client.get('/api/v1/genres/')
+        last_modified = response['Last-Modified']
+        response = client.get(
+            '/api/v1/genres/', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        Genre.objects.create(name='Драма', slug='drama')
+        response = client.get(
+            '/api/v1/genres/', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение в ту же секунду, что и прошлый '
+            'ответ, меняет Last-Modified.'
+        )
+        assert response['Last-Modified'] != last_modified
+
+    def test_04_local_cache_versions_expire(self, client, settings):
+        settings.COLLECTION_VERSION_TIMEOUT = 1
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        etag = client.get('/api/v1/genres/')['ETag']
+
+        # Изменение в другом процессе не трогает версии этого процесса.
+        Genre.objects.filter(pk=genre.pk).update(name='Трагедия')
+        time.sleep(1.1)
+        response = client.get('/api/v1/genres/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что в кэше процесса версии коллекций живут '
+            'ограниченное время.'
+        )
+        assert response.json()['results'][0]['name'] == 'Трагедия'
+        assert [
+            warning.id for warning in check_collection_cache(None)
+        ] == ['api.W002']
+
+    @pytest.mark.usefixtures('shared_cache')
+    def test_05_shared_cache_no_warning(self):
+        assert check_collection_cache(None) == []
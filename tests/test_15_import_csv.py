@@ -0,0 +1,54 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.models import Category, Comments, Genre, Review, Title, User
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+def count_rows(filename):
+    with open(DATA_DIR / filename, encoding='utf-8', newline='') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ImportCsv:
+
+    def test_01_import_static_data(self):
+        output = StringIO()
+        call_command('import_csv', batch_size=10, stdout=output)
+
+        for filename, model in (
+            ('users.csv', User),
+            ('category.csv', Category),
+            ('genre.csv', Genre),
+            ('titles.csv', Title),
+            ('genre_title.csv', Title.genre.through),
+            ('review.csv', Review),
+            ('comments.csv', Comments),
+        ):
+            assert model.objects.count() == count_rows(filename), (
+                f'Проверьте, что команда `import_csv` загружает все строки '
+                f'файла `{filename}`.'
+            )
+        assert 'строк/с' in output.getvalue()
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что дата публикации отзыва берется из файла.'
+        )
+        for title in Title.objects.all():
+            reviews = Review.objects.filter(title=title)
+            assert title.reviews_count == reviews.count()
+            assert title.score_sum == sum(
+                reviews.values_list('score', flat=True)
+            )
+        for review in Review.objects.all():
+            assert review.comments_count == review.comments.count(), (
+                'Проверьте, что команда `import_csv` пересчитывает '
+                'количество комментариев отзывов.'
+            )
@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+BULK_URL = '/api/v1/titles/bulk/'
+
+
+@pytest.fixture
+def catalog():
+    Category.objects.create(name='Фильм', slug='films')
+    Category.objects.create(name='Книга', slug='books')
+    Genre.objects.create(name='Драма', slug='drama')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitlesBulk:
+
+    def test_01_bulk_create(self, admin_client, catalog, query_budget):
+        items = [
+            {
+                'name': f'Произведение {number}',
+                'year': 2000,
+                'description': 'Описание',
+                'category': 'films',
+                'genre': ['drama', 'comedy'],
+            }
+            for number in range(100)
+        ]
+        items[3]['category'] = 'games'
+        items[5]['year'] = 3000
+        items[7]['genre'] = ['horror']
+
+        response, _ = query_budget(
+            'titles-bulk', 12, admin_client.post, BULK_URL, items,
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что пакетное создание произведений возвращает ответ '
+            'со статусом 201.'
+        )
+        data = response.json()
+        assert len(data['results']) == 97
+        assert [error['index'] for error in data['errors']] == [3, 5, 7]
+        assert 'category' in data['errors'][0]['errors']
+        assert 'year' in data['errors'][1]['errors']
+        assert 'genre' in data['errors'][2]['errors']
+
+        assert Title.objects.count() == 97
+        assert Title.genre.through.objects.count() == 97 * 2
+        first = data['results'][0]
+        assert first['category']['slug'] == 'films'
+        assert {genre['slug'] for genre in first['genre']} == {
+            'drama', 'comedy',
+        }
+        assert Title.objects.get(pk=first['id']).name == 'Произведение 0'
+
+    def test_02_bulk_update(self, admin_client, catalog):
+        films = Category.objects.get(slug='films')
+        titles = [
+            Title.objects.create(
+                name=f'Произведение {number}', year=2000,
+                description='', category=films,
+            )
+            for number in range(3)
+        ]
+        response = admin_client.patch(BULK_URL, [
+            {'id': titles[0].id, 'name': 'Новое имя'},
+            {'id': titles[1].id, 'category': 'books', 'genre': ['drama']},
+            {'id': 999999, 'name': 'Нет такого'},
+            {'name': 'Без id'},
+            {'id': titles[1].id, 'genre': ['drama']},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [error['index'] for error in data['errors']] == [2, 3, 4], (
+            'Проверьте, что повторный id в пакете возвращается '
+            'как ошибка элемента.'
+        )
+
+        titles[0].refresh_from_db()
+        titles[1].refresh_from_db()
+        assert titles[0].name == 'Новое имя'
+        assert titles[0].category == films
+        assert titles[1].category.slug == 'books'
+        assert list(titles[1].genre.values_list('slug', flat=True)) == [
+            'drama'
+        ]
+
+    def test_03_bulk_permissions_and_errors(self, admin_client, user_client,
+                                            catalog):
+        response = user_client.post(BULK_URL, [], format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.post(BULK_URL, {}, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        response = admin_client.post(
+            BULK_URL, [{'name': 'Без года'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert Title.objects.count() == 0
+
+    def test_04_bulk_titles_visible(self, admin_client, client, catalog):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        admin_client.post(BULK_URL, [{
+            'name': 'Солярис', 'year': 1972, 'description': 'Станислав Лем',
+            'category': 'films', 'genre': [],
+        }], format='json')
+        response = client.get('/api/v1/titles/', {'search': 'солярис'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после пакетного создания список произведений '
+            'не отдается из устаревшего кэша и поиск находит новые '
+            'произведения.'
+        )
+
+    def test_05_bulk_create_ids(self, admin_client, catalog):
+        removed_id = Title.objects.create(name='Удаленное', year=2000).pk
+        Title.objects.filter(pk=removed_id).delete()
+        response = admin_client.post(BULK_URL, [
+            {
+                'name': f'Произведение {number}', 'year': 2000,
+                'description': 'Описание', 'category': 'films',
+                'genre': [genre],
+            }
+            for number, genre in enumerate(('drama', 'comedy', 'drama'))
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        for item in response.json()['results']:
+            title = Title.objects.get(pk=item['id'])
+            assert item['id'] > removed_id
+            assert title.name == item['name']
+            assert [genre.slug for genre in title.genre.all()] == [
+                genre['slug'] for genre in item['genre']
+            ], (
+                'Проверьте, что созданным пакетом произведениям '
+                'назначены ключи в порядке вставки.'
+            )
@@ -0,0 +1,67 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, Title
+
+EXPORT_URL = '/api/v1/titles/export/'
+
+
+@pytest.fixture
+def exported_titles(admin):
+    category = Category.objects.create(name='Фильм', slug='films')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    titles = []
+    for number in range(7):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000 + number,
+            description='Описание', category=category if number else None,
+        )
+        title.genre.set((drama, comedy) if number % 2 else ())
+        titles.append(title)
+    Review.objects.create(title=titles[1], author=admin, text='', score=7)
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitlesExport:
+
+    def test_01_export_endpoint(self, admin_client, exported_titles,
+                                query_budget):
+        response, _ = query_budget(
+            'titles-export', 10, lambda: b''.join(
+                admin_client.get(EXPORT_URL).streaming_content
+            )
+        )
+        lines = response.decode('utf-8').splitlines()
+        assert len(lines) == len(exported_titles)
+        rows = [json.loads(line) for line in lines]
+        assert [row['id'] for row in rows] == [
+            title.id for title in exported_titles
+        ]
+        assert rows[0]['category'] is None
+        assert rows[0]['genre'] == []
+        assert rows[1] == {
+            'id': exported_titles[1].id,
+            'name': 'Произведение 1',
+            'year': 2001,
+            'description': 'Описание',
+            'category': 'films',
+            'genre': ['comedy', 'drama'],
+            'rating': 7,
+            'reviews_count': 1,
+        }
+
+    def test_02_export_admin_only(self, client, user_client):
+        assert client.get(EXPORT_URL).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(EXPORT_URL).status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_export_command(self, exported_titles):
+        output = StringIO()
+        call_command('export_titles', chunk_size=3, stdout=output)
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(rows) == len(exported_titles)
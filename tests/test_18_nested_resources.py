@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comments, Review, Title
+
+
+@pytest.fixture
+def two_titles(admin):
+    first = Title.objects.create(name='Первое', year=2000, description='Д')
+    second = Title.objects.create(name='Второе', year=2001, description='Д')
+    review = Review.objects.create(
+        title=first, author=admin, text='Отзыв', score=7
+    )
+    comment = Comments.objects.create(
+        review=review, author=admin, text='Комментарий'
+    )
+    return first, second, review, comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18NestedResources:
+
+    def test_01_mismatched_parents(self, admin_client, two_titles):
+        _, second, review, comment = two_titles
+        base = f'/api/v1/titles/{second.id}/reviews/{review.id}/comments/'
+        for url in (base, f'{base}{comment.id}/'):
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что запрос к `{url}` возвращает 404, '
+                'если отзыв не относится к произведению из URL.'
+            )
+
+        response = admin_client.post(base, data={'text': 'Новый'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert Comments.objects.count() == 1
+
+    def test_02_parent_chain_single_query(self, admin_client, two_titles,
+                                          query_budget):
+        first, _, review, _ = two_titles
+        url = f'/api/v1/titles/{first.id}/reviews/{review.id}/comments/'
+        response, _ = query_budget(
+            'comments-create', 6, admin_client.post, url,
+            data={'text': 'Новый'},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Comments.objects.filter(review=review).count() == 2
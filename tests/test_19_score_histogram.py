@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, Title, TitleScoreHistogram
+from reviews.utils import refresh_title_histograms
+from tests.utils import create_single_review, create_titles
+
+HISTOGRAM_URL_TEMPLATE = '/api/v1/titles/{title_id}/score-histogram/'
+REVIEW_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+
+def expected_scores(**counts):
+    return {
+        str(score): counts.get(f'score_{score}', 0)
+        for score in range(1, 11)
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ScoreHistogram:
+
+    def get_histogram(self, client, title_id):
+        response = client.get(HISTOGRAM_URL_TEMPLATE.format(title_id=title_id))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что эндпоинт распределения оценок доступен '
+            'без авторизации.'
+        )
+        return response.json()
+
+    def test_01_histogram_follows_reviews(self, client, admin_client,
+                                          user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        data = self.get_histogram(client, title_id)
+        assert data == {
+            'title': title_id, 'count': 0, 'scores': expected_scores(),
+        }, 'Проверьте, что у произведения без отзывов все счетчики равны 0.'
+
+        review = create_single_review(user_client, title_id, 'Текст', 4)
+        create_single_review(moderator_client, title_id, 'Текст', 9)
+        data = self.get_histogram(client, title_id)
+        assert data['count'] == 2
+        assert data['scores'] == expected_scores(score_4=1, score_9=1)
+
+        review_url = REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id']
+        )
+        response = user_client.patch(review_url, data={'score': 9})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_histogram(client, title_id)['scores'] == (
+            expected_scores(score_9=2)
+        ), 'Проверьте, что изменение оценки переносит отзыв между счетчиками.'
+
+        response = user_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_histogram(client, title_id)['scores'] == (
+            expected_scores(score_9=1)
+        )
+
+        response = client.get(HISTOGRAM_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_constant_queries(self, client, admin, query_budget,
+                                 django_user_model):
+        title = Title.objects.create(name='Фильм', year=2000, description='Д')
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'histogram_{number}',
+                email=f'histogram_{number}@yamdb.fake',
+            )
+            for number in range(30)
+        ]
+        for number, author in enumerate(authors):
+            Review.objects.create(
+                title=title, author=author, text='Текст',
+                score=number % 10 + 1,
+            )
+        response, _ = query_budget(
+            'titles-score-histogram', 1, client.get,
+            HISTOGRAM_URL_TEMPLATE.format(title_id=title.id),
+        )
+        assert response.json()['scores'] == expected_scores(**{
+            f'score_{score}': 3 for score in range(1, 11)
+        })
+
+    def test_03_refresh_and_cascade(self, admin):
+        title = Title.objects.create(name='Фильм', year=2000, description='Д')
+        Review.objects.create(title=title, author=admin, text='Т', score=3)
+        TitleScoreHistogram.objects.all().delete()
+
+        refresh_title_histograms([title.id])
+        histogram = TitleScoreHistogram.objects.get(title=title)
+        assert histogram.scores == expected_scores(score_3=1)
+
+        title.delete()
+        assert not TitleScoreHistogram.objects.exists()
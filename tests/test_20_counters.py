@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comments, Review, Title
+from tests.utils import create_single_review, create_titles
+
+REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+COMMENTS_URL_TEMPLATE = (
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Counters:
+
+    def test_01_counters_in_lists(self, client, admin_client, user_client,
+                                  moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Текст', 5
+        ).json()['id']
+        create_single_review(moderator_client, title_id, 'Текст', 7)
+
+        comments_url = COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        comment_ids = [
+            user_client.post(comments_url, data={'text': 'Ок'}).json()['id']
+            for _ in range(3)
+        ]
+        response = user_client.delete(f'{comments_url}{comment_ids[0]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+        title = client.get('/api/v1/titles/').json()['results'][0]
+        assert title['reviews_count'] == 2, (
+            'Проверьте, что в списке произведений есть поле `reviews_count`.'
+        )
+        reviews = client.get(
+            REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        ).json()['results']
+        counts = {review['id']: review['comments_count'] for review in reviews}
+        assert counts[review_id] == 2, (
+            'Проверьте, что в списке отзывов есть поле `comments_count`, '
+            'учитывающее создание и удаление комментариев.'
+        )
+        assert sorted(counts.values()) == [0, 2]
+
+        response = user_client.patch(
+            f'{REVIEWS_URL_TEMPLATE.format(title_id=title_id)}{review_id}/',
+            data={'comments_count': 100},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['comments_count'] == 2
+
+    def test_02_reconcile_counters(self, admin, capsys):
+        title = Title.objects.create(name='Фильм', year=2000, description='Д')
+        review = Review.objects.create(
+            title=title, author=admin, text='Т', score=4
+        )
+        Comments.objects.create(review=review, author=admin, text='К')
+        Title.objects.update(reviews_count=10, score_sum=100)
+        Review.objects.update(comments_count=10)
+
+        call_command('reconcile_counters', chunk_size=1)
+        title.refresh_from_db()
+        review.refresh_from_db()
+        assert (title.reviews_count, title.score_sum) == (1, 4)
+        assert review.comments_count == 1
+        assert 'Отзывы: пересчитано 1' in capsys.readouterr().out
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.models import Review, Title
+from tests.utils import walk_cursor_pages
+
+LATEST_URL = '/api/v1/reviews/latest/'
+
+
+@pytest.fixture
+def reviews(django_user_model):
+    titles = [
+        Title.objects.create(
+            name=f'Произведение {number}', year=2000, description='Д'
+        )
+        for number in range(3)
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'latest_{number}', email=f'latest_{number}@yamdb.fake',
+        )
+        for number in range(4)
+    ]
+    created = [
+        Review.objects.create(
+            title=title, author=author, text='Текст', score=5
+        )
+        for author in authors
+        for title in titles
+    ]
+    # Одинаковая дата у части отзывов проверяет разделитель по `id`.
+    Review.objects.filter(pk__in=[r.pk for r in created[:6]]).update(
+        pub_date=created[0].pub_date,
+    )
+    return Review.objects.order_by('-pub_date', '-id')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21LatestReviews:
+
+    def test_01_feed_order(self, client, reviews):
+        ids = walk_cursor_pages(client, LATEST_URL)
+        assert ids == [review.id for review in reviews], (
+            'Проверьте, что лента отдает отзывы всех произведений '
+            'по убыванию даты публикации без повторов.'
+        )
+
+        item = client.get(LATEST_URL).json()['results'][0]
+        review = reviews[0]
+        assert item['title'] == review.title_id
+        assert item['title_name'] == review.title.name
+        assert item['author'] == review.author.username
+
+    def test_02_feed_queries(self, client, reviews, query_budget):
+        response, _ = query_budget(
+            'latest-reviews', 2, client.get, f'{LATEST_URL}?page_size=12'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 12
+        # Имена авторов уже в кэше пользователей.
+        response, _ = query_budget(
+            'latest-reviews', 1, client.get, f'{LATEST_URL}?page_size=10'
+        )
+        assert len(response.json()['results']) == 10
+
+        response = client.post(LATEST_URL, data={'text': 'Текст'})
+        assert response.status_code in (
+            HTTPStatus.UNAUTHORIZED, HTTPStatus.METHOD_NOT_ALLOWED
+        )
+
+    def test_03_feed_uses_index(self, reviews):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite.')
+        plan = Review.objects.order_by('-pub_date', '-id')[:5].explain()
+        assert 'review_pub_date_idx' in plan, (
+            'Проверьте, что лента отзывов использует индекс даты '
+            f'публикации:\n{plan}'
+        )
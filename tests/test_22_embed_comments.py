@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.user_cache import user_cache
+from reviews.models import Comments, Review, Title
+
+REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+
+@pytest.fixture
+def reviews_with_comments(django_user_model):
+    title = Title.objects.create(name='Фильм', year=2000, description='Д')
+    authors, commenters = (
+        [
+            django_user_model.objects.create_user(
+                username=f'{prefix}_{number}',
+                email=f'{prefix}_{number}@yamdb.fake',
+            )
+            for number in range(5)
+        ]
+        for prefix in ('embed', 'commenter')
+    )
+    reviews = [
+        Review.objects.create(
+            title=title, author=author, text='Текст', score=5
+        )
+        for author in authors
+    ]
+    for number, review in enumerate(reviews):
+        for author in commenters[:number]:
+            Comments.objects.create(
+                review=review, author=author, text=f'От {author.username}'
+            )
+    return title, reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22EmbedComments:
+
+    def test_01_embedded_comments(self, client, reviews_with_comments,
+                                  query_budget):
+        title, reviews = reviews_with_comments
+        url = REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        response = client.get(url)
+        assert 'comments' not in response.json()['results'][0], (
+            'Проверьте, что комментарии встраиваются только по запросу.'
+        )
+
+        # С пустым кэшем пользователей авторы загружаются самим запросом.
+        user_cache.clear()
+        response, _ = query_budget(
+            'reviews-list-embed', 5, client.get, f'{url}?embed_comments=2'
+        )
+        assert response.status_code == HTTPStatus.OK
+        for item, review in zip(response.json()['results'], reviews):
+            expected = list(
+                review.comments.order_by('-pub_date', '-id').values_list(
+                    'id', flat=True,
+                )[:2]
+            )
+            assert [c['id'] for c in item['comments']] == expected, (
+                'Проверьте, что к каждому отзыву встраиваются его последние '
+                'N комментариев от новых к старым.'
+            )
+        comment = response.json()['results'][4]['comments'][0]
+        assert comment['author'] == 'commenter_3'
+        assert set(comment) == {'id', 'text', 'author', 'pub_date'}
+
+    @pytest.mark.parametrize('value', ('abc', '-1', '100'))
+    def test_02_invalid_limit(self, client, reviews_with_comments, value):
+        title, _ = reviews_with_comments
+        response = client.get(
+            REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            {'embed_comments': value},
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comments, Review, Title, TitleScoreHistogram
+
+REVIEWS_URL = '/api/v1/moderation/reviews/'
+COMMENTS_URL = '/api/v1/moderation/comments/'
+
+
+@pytest.fixture
+def spam(django_user_model):
+    titles = [
+        Title.objects.create(name=f'Фильм {number}', year=2000,
+                             description='Д')
+        for number in range(2)
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'spam_{number}', email=f'spam_{number}@yamdb.fake',
+        )
+        for number in range(10)
+    ]
+    reviews = [
+        Review.objects.create(
+            title=titles[number % 2], author=author, text='Спам',
+            score=number % 10 + 1,
+        )
+        for number, author in enumerate(authors)
+    ]
+    comments = [
+        Comments.objects.create(review=review, author=author, text='Спам')
+        for review in reviews[:2]
+        for author in authors[:3]
+    ]
+    return titles, reviews, comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BulkModeration:
+
+    def test_01_permissions(self, client, user_client, spam):
+        _, reviews, _ = spam
+        data = {'ids': [reviews[0].id]}
+        response = client.post(REVIEWS_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(COMMENTS_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пакетная модерация недоступна пользователю.'
+        )
+        assert Review.objects.count() == len(reviews)
+
+    def test_02_bulk_delete_reviews(self, moderator_client, spam,
+                                    query_budget):
+        titles, reviews, _ = spam
+        for title in titles:
+            moderator_client.get(f'/api/v1/titles/{title.id}/')
+        removed = reviews[:8]
+        ids = [review.id for review in removed] + [10 ** 6]
+        response, _ = query_budget(
+            'moderation-reviews', 12, moderator_client.post, REVIEWS_URL,
+            data={'ids': ids}, format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'deleted': sorted(review.id for review in removed),
+            'not_found': [10 ** 6],
+            'comments_deleted': 6,
+        }
+        assert not Comments.objects.exists()
+        for title in titles:
+            title.refresh_from_db()
+            left = Review.objects.filter(title=title)
+            assert title.reviews_count == left.count(), (
+                'Проверьте, что после пакетного удаления пересчитываются '
+                'агрегаты произведения.'
+            )
+            assert title.score_sum == sum(review.score for review in left)
+            histogram = TitleScoreHistogram.objects.get(title=title)
+            assert sum(histogram.scores.values()) == left.count()
+            response = moderator_client.get(f'/api/v1/titles/{title.id}/')
+            assert response.json()['rating'] == title.rating, (
+                'Проверьте, что сразу после пакетного удаления API '
+                'не отдает устаревший рейтинг.'
+            )
+
+    def test_03_bulk_delete_comments(self, admin_client, spam):
+        _, reviews, comments = spam
+        ids = [comment.id for comment in comments[:4]]
+        response = admin_client.post(
+            COMMENTS_URL, data={'ids': ids}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'deleted': sorted(ids), 'not_found': []}
+        for review in reviews[:2]:
+            review.refresh_from_db()
+            assert review.comments_count == review.comments.count()
+
+    @pytest.mark.parametrize('data', (
+        {}, {'ids': []}, {'ids': ['abc']}, {'ids': [0]},
+        {'ids': list(range(1, 1002))},
+    ))
+    def test_04_invalid_payload(self, moderator_client, data):
+        response = moderator_client.post(COMMENTS_URL, data=data,
+                                         format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
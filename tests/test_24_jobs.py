@@ -0,0 +1,138 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from reviews import jobs, utils
+from reviews.models import Job, Review, Title
+
+JOBS_URL = '/api/v1/jobs/'
+RECONCILE_URL = '/api/v1/jobs/reconcile-counters/'
+
+
+@pytest.fixture
+def flaky_job():
+    calls = []
+
+    @jobs.register_job('test_flaky')
+    def flaky(fail_times):
+        calls.append(fail_times)
+        if len(calls) <= fail_times:
+            raise RuntimeError('Временная ошибка')
+
+    yield calls
+    del jobs.JOB_HANDLERS['test_flaky']
+
+
+def make_due():
+    Job.objects.update(run_after=timezone.now() - timedelta(seconds=1))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Jobs:
+
+    def test_01_enqueue_deduplicates_by_key(self, flaky_job):
+        first = jobs.enqueue('test_flaky', {'fail_times': 0}, key='same')
+        second = jobs.enqueue('test_flaky', {'fail_times': 0}, key='same')
+        assert first.pk == second.pk, (
+            'Проверьте, что ожидающая задача с тем же ключом не дублируется.'
+        )
+        jobs.enqueue('test_flaky', {'fail_times': 0})
+        jobs.enqueue('test_flaky', {'fail_times': 0})
+        assert Job.objects.count() == 3
+
+        job = jobs.claim_job('worker-1')
+        assert job.pk == first.pk and job.status == 'running'
+        assert jobs.enqueue('test_flaky', key='same').pk != first.pk, (
+            'Проверьте, что после запуска задачи ключ снова свободен.'
+        )
+
+        with pytest.raises(ValueError):
+            jobs.enqueue('unknown')
+
+    def test_02_retries_with_backoff(self, flaky_job):
+        job = jobs.enqueue('test_flaky', {'fail_times': 2}, max_attempts=3)
+        call_command('run_worker', once=True)
+        job.refresh_from_db()
+        assert job.status == 'pending' and job.attempts == 1
+        assert 'Временная ошибка' in job.last_error
+        assert job.run_after > timezone.now(), (
+            'Проверьте, что повтор задачи откладывается.'
+        )
+
+        make_due()
+        call_command('run_worker', once=True)
+        make_due()
+        call_command('run_worker', once=True)
+        job.refresh_from_db()
+        assert job.status == 'done' and job.attempts == 3
+        assert len(flaky_job) == 3
+
+        failed = jobs.enqueue('test_flaky', {'fail_times': 5}, max_attempts=1)
+        call_command('run_worker', once=True)
+        failed.refresh_from_db()
+        assert failed.status == 'failed' and failed.finished_at
+
+    def test_03_claim_and_stale_jobs(self, flaky_job):
+        job = jobs.enqueue('test_flaky', {'fail_times': 0})
+        assert jobs.claim_job('worker-1').pk == job.pk
+        assert jobs.claim_job('worker-2') is None, (
+            'Проверьте, что задачу забирает только один воркер.'
+        )
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        assert jobs.release_stale_jobs(timedelta(minutes=10)) == 1
+        assert jobs.claim_job('worker-2').attempts == 2
+
+    @pytest.mark.usefixtures('shared_cache')
+    def test_04_status_endpoint(self, admin_client, user_client, admin):
+        title = Title.objects.create(name='Фильм', year=2000, description='Д')
+        Review.objects.create(title=title, author=admin, text='Т', score=8)
+        Title.objects.update(score_sum=0, reviews_count=0)
+
+        assert user_client.get(JOBS_URL).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.post(RECONCILE_URL)
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert admin_client.post(RECONCILE_URL).json()['id'] == (
+            response.json()['id']
+        )
+
+        call_command('run_worker', once=True)
+        title.refresh_from_db()
+        assert (title.score_sum, title.reviews_count) == (8, 1)
+
+        response = admin_client.get(JOBS_URL, {'status': 'done'})
+        assert response.status_code == HTTPStatus.OK
+        assert [job['name'] for job in response.json()['results']] == [
+            'reconcile_counters'
+        ]
+
+    def test_05_chunked_job_commits_chunks(self, admin, monkeypatch):
+        title = Title.objects.create(name='Фильм', year=2000, description='Д')
+        Review.objects.create(title=title, author=admin, text='Т', score=8)
+        Title.objects.create(name='Книга', year=2000, description='Д')
+        refresh = utils.refresh_title_aggregates
+        savepoints = []
+
+        def spy(ids):
+            savepoints.append(list(connection.savepoint_ids))
+            refresh(ids)
+
+        monkeypatch.setattr(utils, 'refresh_title_aggregates', spy)
+        job = jobs.enqueue('reconcile_counters', {'chunk_size': 1})
+        job = jobs.run_job(jobs.claim_job('worker-1'))
+        assert job.status == 'done'
+        assert savepoints == [[], []], (
+            'Проверьте, что порции пересчета фиксируются отдельными '
+            'транзакциями, а не точками сохранения общей транзакции.'
+        )
+
+    def test_06_reconcile_requires_shared_cache(self, admin_client):
+        response = admin_client.post(RECONCILE_URL)
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+            'Проверьте, что с кэшем в памяти процесса пересчет не ставится '
+            'в очередь: воркер не сбросит кэш ответов веб-процессов.'
+        )
+        assert not Job.objects.exists()
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.fixtures.fixture_queries import find_full_scans
+
+
+# Эндпоинты списков и таблицы, которые им разрешено просматривать целиком.
+LIST_ENDPOINTS = (
+    ('titles-list', '/api/v1/titles/', ('reviews_title',)),
+    ('titles-year', '/api/v1/titles/?year=1984', ()),
+    ('titles-name', '/api/v1/titles/?name=Терминатор', ()),
+    ('titles-genre', '/api/v1/titles/?genre=drama', ()),
+    ('titles-category', '/api/v1/titles/?category=films', ()),
+    ('titles-search', '/api/v1/titles/?search=Терм', ()),
+    ('titles-facets', '/api/v1/titles/?year=1984&facets=genre,year', ()),
+    ('titles-cursor', '/api/v1/titles/?year=1984&pagination=cursor', ()),
+    ('reviews-list', '/api/v1/titles/{title_id}/reviews/', ()),
+    (
+        'reviews-embed',
+        '/api/v1/titles/{title_id}/reviews/?embed_comments=3', (),
+    ),
+    (
+        'comments-list',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/', (),
+    ),
+    (
+        'comments-cursor',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '?pagination=cursor', (),
+    ),
+    ('latest-reviews', '/api/v1/reviews/latest/', ()),
+    ('users-list', '/api/v1/users/?search=adm', ()),
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25QueryPlans:
+
+    @pytest.mark.parametrize('endpoint, url, allowed', LIST_ENDPOINTS)
+    def test_01_list_endpoints_use_indexes(self, endpoint, url, allowed,
+                                           admin_client, catalog,
+                                           query_plans):
+        url = url.format(
+            title_id=catalog['title'].id, review_id=catalog['review'].id
+        )
+        response = query_plans(
+            endpoint, admin_client.get, url, allowed=allowed
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_full_scan_detected(self, query_plans):
+        assert find_full_scans(
+            'SELECT * FROM "reviews_review" WHERE "reviews_review"."text" = 1'
+        ) == ['reviews_review']
+        assert find_full_scans(
+            'SELECT * FROM "reviews_user" WHERE "id" IN (SELECT U0."id" '
+            'FROM "reviews_title" U0 WHERE U0."description" = 1)'
+        ) == ['reviews_title'], (
+            'Проверьте, что псевдонимы таблиц во вложенных запросах '
+            'сопоставляются с таблицами.'
+        )
+        assert find_full_scans(
+            'SELECT * FROM "reviews_title" WHERE "year" = 1'
+        ) == []
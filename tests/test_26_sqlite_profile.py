@@ -0,0 +1,131 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.db import connections
+from django.test import override_settings
+
+from reviews.sqlite import apply_sqlite_pragmas
+
+PROFILES = ('default', 'production')
+
+
+def connect(path, profile):
+    """Соединение, ожидание блокировок в котором задает только профиль."""
+
+    connection = sqlite3.connect(
+        path, timeout=0, isolation_level=None, check_same_thread=False,
+    )
+    apply_sqlite_pragmas(connection, settings.SQLITE_PROFILES[profile])
+    return connection
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / 'load.sqlite3'
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            'CREATE TABLE review (id INTEGER PRIMARY KEY, score INTEGER)'
+        )
+    return path
+
+
+def run_load(path, profile, writers=4, readers=4, writes=50, reads=200):
+    """
+    Параллельно пишет отзывы и читает агрегаты.
+    Возвращает число ошибок блокировки и время выполнения.
+    """
+    errors = []
+
+    def execute(connection, *args):
+        try:
+            return connection.execute(*args).fetchall()
+        except sqlite3.OperationalError as error:
+            errors.append(str(error))
+
+    def write():
+        connection = connect(path, profile)
+        for number in range(writes):
+            execute(
+                connection, 'INSERT INTO review (score) VALUES (?)',
+                (number % 10 + 1,),
+            )
+
+    def read():
+        connection = connect(path, profile)
+        for _ in range(reads):
+            execute(connection, 'SELECT COUNT(*), AVG(score) FROM review')
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    threads += [threading.Thread(target=read) for _ in range(readers)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors, time.monotonic() - started
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SqliteProfile:
+
+    def test_01_pragmas_on_new_connection(self):
+        pragmas = {'cache_size': -1234, 'busy_timeout': 321}
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            connection = connections.create_connection('default')
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('PRAGMA cache_size')
+                    assert cursor.fetchone()[0] == -1234
+                    cursor.execute('PRAGMA busy_timeout')
+                    assert cursor.fetchone()[0] == 321, (
+                        'Проверьте, что PRAGMA профиля применяются '
+                        'к каждому новому соединению.'
+                    )
+            finally:
+                connection.close()
+
+    @pytest.mark.parametrize('profile', PROFILES)
+    def test_02_writer_with_open_reader(self, database, profile):
+        reader = connect(database, profile)
+        writer = connect(database, profile)
+        reader.execute('BEGIN')
+        assert reader.execute('SELECT COUNT(*) FROM review').fetchone() == (0,)
+
+        if profile == 'default':
+            # Без WAL фиксация ждет, пока читатель отпустит блокировку.
+            writer.execute('BEGIN')
+            writer.execute('INSERT INTO review (score) VALUES (5)')
+            with pytest.raises(sqlite3.OperationalError, match='locked'):
+                writer.execute('COMMIT')
+            writer.execute('ROLLBACK')
+        else:
+            writer.execute('INSERT INTO review (score) VALUES (5)')
+            assert reader.execute(
+                'SELECT COUNT(*) FROM review'
+            ).fetchone() == (0,), 'Читатель видит свой снимок данных.'
+        reader.execute('COMMIT')
+
+    def test_03_concurrent_load(self, database, capsys):
+        results = {}
+        for profile in PROFILES:
+            path = database.with_name(f'{profile}.sqlite3')
+            path.write_bytes(database.read_bytes())
+            results[profile] = run_load(path, profile)
+        with capsys.disabled():
+            for profile, (errors, elapsed) in results.items():
+                print(
+                    f'\n{profile}: ошибок блокировки {len(errors)}, '
+                    f'{elapsed:.2f} с'
+                )
+        errors, _ = results['production']
+        assert not errors, (
+            'Проверьте, что в профиле production параллельные чтения '
+            f'и записи выполняются без ошибок блокировки: {errors[:3]}'
+        )
+        with connect(path, 'production') as connection:
+            assert connection.execute(
+                'SELECT COUNT(*) FROM review'
+            ).fetchone() == (4 * 50,)
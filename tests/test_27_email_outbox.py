@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+
+from reviews.models import EmailOutbox
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+class FlakyBackend(EmailBackend):
+    """Почтовый бэкенд, не доставляющий письма на адреса с 'fail'."""
+
+    opened = 0
+
+    def open(self):
+        if not getattr(self, 'is_open', False):
+            FlakyBackend.opened += 1
+            self.is_open = True
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any('fail' in address for address in message.to):
+                raise ConnectionError('Сервер отклонил письмо')
+        return super().send_messages(messages)
+
+
+def signup(client, username):
+    response = client.post(SIGNUP_URL, data={
+        'email': f'{username}@yamdb.fake', 'username': username,
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27EmailOutbox:
+
+    def test_01_signup_queues_mail(self, client):
+        outbox_before = len(mail.outbox)
+        signup(client, 'outbox_user')
+        assert len(mail.outbox) == outbox_before, (
+            'Проверьте, что регистрация не отправляет письмо синхронно.'
+        )
+        message = EmailOutbox.objects.get()
+        assert message.status == 'pending'
+        assert message.recipients == ['outbox_user@yamdb.fake']
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == outbox_before + 1
+        assert 'Код для входа' in mail.outbox[-1].body
+        message.refresh_from_db()
+        assert message.status == 'sent' and message.sent_at
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == outbox_before + 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    @override_settings(EMAIL_BACKEND=f'{__name__}.FlakyBackend')
+    def test_02_batches_and_retries(self, client):
+        FlakyBackend.opened = 0
+        for number in range(5):
+            signup(client, f'outbox_{number}')
+        signup(client, 'outbox_fail')
+        EmailOutbox.objects.filter(
+            recipients__0='outbox_fail@yamdb.fake',
+        ).update(max_attempts=2)
+
+        call_command('send_outbox', batch_size=2)
+        assert FlakyBackend.opened == 1, (
+            'Проверьте, что все порции писем отправляются через одно '
+            'соединение с почтовым сервером.'
+        )
+        assert EmailOutbox.objects.filter(status='sent').count() == 5
+        failed = EmailOutbox.objects.get(status='pending')
+        assert failed.attempts == 1 and 'ConnectionError' in failed.last_error
+
+        EmailOutbox.objects.filter(pk=failed.pk).update(
+            send_after=failed.created_at,
+        )
+        call_command('send_outbox')
+        failed.refresh_from_db()
+        assert failed.status == 'failed' and failed.attempts == 2
@@ -0,0 +1,154 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import ClaimsAccessToken, remember_token_version
+from api.checks import check_claims_cache
+from api.user_cache import user_cache
+from reviews.models import User
+
+
+def make_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('shared_cache')
+class Test28ClaimsAuth:
+
+    def test_01_token_view_issues_claims(self, client, user):
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что эндпоинт `/api/v1/auth/token/` выдает токен.'
+        )
+        token = AccessToken(response.json()['token'])
+        assert token['username'] == user.username
+        assert token['role'] == user.role
+        assert token['token_version'] == user.token_version, (
+            'Проверьте, что токен содержит роль и версию токенов '
+            'пользователя.'
+        )
+
+    def test_02_claims_save_user_query(self, user, query_budget):
+        # Разные адреса, чтобы второй ответ не был взят из кэша.
+        plain = make_client(AccessToken.for_user(user))
+        claims = make_client(ClaimsAccessToken.for_user(user))
+        response, plain_queries = query_budget(
+            'titles-list', 4, plain.get, '/api/v1/titles/?year=1',
+        )
+        assert response.status_code == HTTPStatus.OK
+        response, claims_queries = query_budget(
+            'titles-list', 3, claims.get, '/api/v1/titles/?year=2',
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert claims_queries == plain_queries - 1, (
+            'Проверьте, что пользователь из токена с данными '
+            'не загружается из базы.'
+        )
+
+    def test_03_lazy_fields(self, user):
+        client = make_client(ClaimsAccessToken.for_user(user))
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['email'] == user.email
+        assert data['bio'] == user.bio, (
+            'Проверьте, что остальные поля пользователя из токена '
+            'загружаются из базы при обращении к ним.'
+        )
+
+    def test_04_role_change_takes_effect(self, admin_client, user):
+        client = make_client(ClaimsAccessToken.for_user(user))
+        assert client.get('/api/v1/users/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.token_version == 1, (
+            'Проверьте, что смена роли увеличивает версию токенов.'
+        )
+        assert client.get('/api/v1/users/').status_code == HTTPStatus.OK, (
+            'Проверьте, что новая роль действует для выданного ранее '
+            'токена.'
+        )
+
+    def test_05_demotion_takes_effect(self, admin_client, moderator):
+        client = make_client(ClaimsAccessToken.for_user(moderator))
+        url = '/api/v1/moderation/reviews/'
+        response = client.post(url, data={'ids': [1]}, format='json')
+        assert response.status_code == HTTPStatus.OK
+        admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'},
+        )
+        response = client.post(url, data={'ids': [1]}, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что токен с устаревшей ролью проверяется по базе.'
+        )
+
+    def test_06_bio_change_keeps_version(self, user):
+        client = make_client(ClaimsAccessToken.for_user(user))
+        response = client.patch('/api/v1/users/me/', data={'bio': 'new'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.bio == 'new'
+        assert user.token_version == 0, (
+            'Проверьте, что изменение полей, которых нет в токене, '
+            'не делает токены устаревшими.'
+        )
+
+    def test_07_deleted_user(self, admin_client, user):
+        client = make_client(ClaimsAccessToken.for_user(user))
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удаленного пользователя отклоняется.'
+        )
+
+    def test_08_stale_version_not_restored(self, admin_client, moderator):
+        client = make_client(ClaimsAccessToken.for_user(moderator))
+        stale = User.objects.get(pk=moderator.pk)
+        admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'},
+        )
+        # Другой процесс прочитал пользователя до изменения роли.
+        remember_token_version(stale)
+        response = client.post(
+            '/api/v1/moderation/reviews/', data={'ids': [1]}, format='json',
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что устаревшая версия токенов не заменяет '
+            'записанную после изменения пользователя.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ClaimsAuthLocalCache:
+
+    def test_01_claims_ignored(self, user, query_budget):
+        plain = make_client(AccessToken.for_user(user))
+        claims = make_client(ClaimsAccessToken.for_user(user))
+        _, plain_queries = query_budget(
+            'titles-list', 4, plain.get, '/api/v1/titles/?year=1',
+        )
+        user_cache.clear()
+        _, claims_queries = query_budget(
+            'titles-list', 4, claims.get, '/api/v1/titles/?year=2',
+        )
+        assert claims_queries == plain_queries, (
+            'Проверьте, что с кэшем в памяти процесса данным токена '
+            'не доверяют: сброс версии не виден другим процессам.'
+        )
+        assert [
+            warning.id for warning in check_claims_cache(None)
+        ] == ['api.W001']
@@ -0,0 +1,175 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from api.authentication import ClaimsAccessToken, TOKEN_VERSION_KEY
+from api.user_cache import UserSnapshotCache, user_cache
+from reviews.models import Comments, Review, Title
+
+
+@pytest.fixture
+def review(user):
+    title = Title.objects.create(name='Терминатор', year=1984)
+    return Review.objects.create(
+        title=title, author=user, text='Отзыв', score=7
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29UserCache:
+
+    def test_01_lru_eviction(self, django_user_model, query_budget):
+        users = [
+            django_user_model.objects.create_user(
+                username=f'cached_{number}',
+                email=f'cached_{number}@yamdb.fake',
+            )
+            for number in range(3)
+        ]
+        cache = UserSnapshotCache(max_size=2, timeout=60)
+        first, second, third = (user.pk for user in users)
+        cache.get_many([first, second])
+        cache.get(first)
+        cache.get(third)
+        stats = cache.stats()
+        assert stats['size'] == 2
+        assert stats['evictions'] == 1
+        # Вытеснена давно не использованная запись, а не первая.
+        snapshot, _ = query_budget('user-cache', 0, cache.get, first)
+        assert snapshot.username == 'cached_0'
+        assert cache.get(404) is None
+
+    def test_02_timeout(self, user):
+        cache = UserSnapshotCache(max_size=10, timeout=0)
+        cache.get(user.pk)
+        cache.get(user.pk)
+        assert cache.stats()['misses'] == 2, (
+            'Проверьте, что устаревшие записи загружаются заново.'
+        )
+
+    def test_03_warm_requests_skip_users(self, admin_client, review,
+                                         query_budget):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response, cold = query_budget(
+            'reviews-list', 5, admin_client.get, url
+        )
+        assert response.status_code == HTTPStatus.OK
+        # Другой адрес, чтобы ответ не был взят из кэша ответов.
+        response, warm = query_budget(
+            'reviews-list', 4, admin_client.get, f'{url}?page=1'
+        )
+        assert response.json()['results'][0]['author'] == 'TestUser'
+        assert warm == cold - 1, (
+            'Проверьте, что авторы отзывов берутся из кэша пользователей.'
+        )
+
+    def test_04_invalidation(self, admin_client, user_client, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+        user_client.get(url)
+        response = admin_client.patch(
+            '/api/v1/users/TestUser/', data={'username': 'Renamed'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.get(url)
+        assert response.json()['author'] == 'Renamed', (
+            'Проверьте, что изменение пользователя сбрасывает его снимок.'
+        )
+
+        admin_client.delete('/api/v1/users/Renamed/')
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удаление пользователя сбрасывает его снимок.'
+        )
+
+    def test_05_stats_endpoint(self, admin_client, user_client, review):
+        user_cache.clear()
+        url = '/api/v1/users/cache-stats/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        reviews_url = f'/api/v1/titles/{review.title_id}/reviews/'
+        admin_client.get(reviews_url)
+        admin_client.get(f'{reviews_url}?page=1')
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['hits'] >= 1 and data['misses'] >= 1
+        assert 0 < data['hit_rate'] < 1, (
+            'Проверьте, что эндпоинт `/api/v1/users/cache-stats/` '
+            'возвращает статистику кэша пользователей.'
+        )
+
+    @pytest.mark.usefixtures('shared_cache')
+    def test_06_stale_snapshot_not_trusted(self, admin_client, moderator):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {ClaimsAccessToken.for_user(moderator)}'
+        )
+        stale = user_cache.get(moderator.pk)
+        admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'},
+        )
+        # Другой процесс еще хранит снимок с прежней ролью,
+        # а версия токенов вытеснена из кэша.
+        user_cache.set_many([stale])
+        cache.delete(TOKEN_VERSION_KEY.format(moderator.pk))
+        for _ in range(2):
+            response = client.post(
+                '/api/v1/moderation/reviews/', data={'ids': [1]},
+                format='json',
+            )
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что версия токенов проверяется по базе, '
+                'а не по снимку пользователя в памяти процесса.'
+            )
+        assert cache.get(TOKEN_VERSION_KEY.format(moderator.pk)) == 1
+
+    def test_07_embedded_authors_preloaded(self, admin_client,
+                                           django_user_model, query_budget):
+        users = iter([
+            django_user_model.objects.create_user(
+                username=f'embedded_{number}',
+                email=f'embedded_{number}@yamdb.fake',
+            )
+            for number in range(18)
+        ])
+        queries = []
+        for reviews_count in (1, 5):
+            title = Title.objects.create(
+                name=f'Отзывов: {reviews_count}', year=2000,
+            )
+            for _ in range(reviews_count):
+                review = Review.objects.create(
+                    title=title, author=next(users), text='Отзыв', score=5,
+                )
+                for _ in range(2):
+                    Comments.objects.create(
+                        review=review, author=next(users), text='Ок',
+                    )
+            user_cache.clear()
+            response, executed = query_budget(
+                'reviews-list-embed', 6, admin_client.get,
+                f'/api/v1/titles/{title.id}/reviews/?embed_comments=2',
+            )
+            assert response.status_code == HTTPStatus.OK
+            queries.append(executed)
+        assert queries[0] == queries[1], (
+            'Проверьте, что авторы отзывов и встроенных комментариев '
+            'загружаются одним запросом.'
+        )
+
+    def test_08_local_snapshot_not_trusted(self, admin_client,
+                                           moderator_client, moderator):
+        stale = user_cache.get(moderator.pk)
+        admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'},
+        )
+        # Снимок с прежней ролью остался в памяти другого процесса.
+        user_cache.set_many([stale])
+        response = moderator_client.post(
+            '/api/v1/moderation/reviews/', data={'ids': [1]}, format='json',
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что с кэшем в памяти процесса роль пользователя '
+            'проверяется по базе, а не по снимку.'
+        )
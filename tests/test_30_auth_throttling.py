@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.throttling import TokenBucketThrottle
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        TokenBucketThrottle, 'timer', staticmethod(lambda: now[0])
+    )
+    return now
+
+
+def set_rate(monkeypatch, scope, rate):
+    monkeypatch.setitem(TokenBucketThrottle.THROTTLE_RATES, scope, rate)
+
+
+def signup_data(number, email=None):
+    return {
+        'email': email or f'bot_{number}@yamdb.fake',
+        'username': f'bot_{number}',
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30AuthThrottling:
+
+    def test_01_email_bucket(self, client, clock, monkeypatch):
+        set_rate(monkeypatch, 'auth-email', '3/min')
+        for number in range(3):
+            response = client.post(
+                SIGNUP_URL, data=signup_data(number, 'same@yamdb.fake')
+            )
+            assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                SIGNUP_URL, data=signup_data(3, 'Same@yamdb.fake ')
+            )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена для одного email.'
+        )
+        assert 'Retry-After' in response
+        assert not context.captured_queries, (
+            'Проверьте, что отклоненный запрос не обращается к базе.'
+        )
+        response = client.post(SIGNUP_URL, data=signup_data(4))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что корзины разных email независимы.'
+        )
+
+    def test_02_bucket_refills(self, client, clock, monkeypatch):
+        set_rate(monkeypatch, 'auth-ip', '2/min')
+        data = {'username': 'nobody', 'confirmation_code': 'wrong'}
+        for _ in range(2):
+            response = client.post(TOKEN_URL, data=data)
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.post(TOKEN_URL, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        clock[0] += 30
+        response = client.post(TOKEN_URL, data=data)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что корзина пополняется со временем.'
+        )
+        response = client.post(TOKEN_URL, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_03_global_ceiling(self, client, clock, monkeypatch):
+        set_rate(monkeypatch, 'auth-global', '3/min')
+        for number in range(3):
+            response = client.post(
+                SIGNUP_URL, data=signup_data(number),
+                REMOTE_ADDR=f'10.0.0.{number}',
+            )
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(
+            TOKEN_URL, data={'username': 'bot_0', 'confirmation_code': '1'},
+            REMOTE_ADDR='10.0.0.9',
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что общий предел действует на оба эндпоинта.'
+        )
+
+    def test_04_token_header_ignored(self, client, clock, monkeypatch):
+        set_rate(monkeypatch, 'auth-ip', '1/min')
+        client.post(SIGNUP_URL, data=signup_data(0))
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                SIGNUP_URL, data=signup_data(1),
+                HTTP_AUTHORIZATION='Bearer invalid',
+            )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert not context.captured_queries
+
+    def test_05_rejected_requests_keep_tokens(self, client, clock,
+                                              monkeypatch):
+        set_rate(monkeypatch, 'auth-ip', '3/min')
+        set_rate(monkeypatch, 'auth-global', '6/min')
+        for number in range(20):
+            response = client.post(
+                SIGNUP_URL, data=signup_data(number), REMOTE_ADDR='10.0.0.1',
+            )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        for number in range(3):
+            response = client.post(
+                SIGNUP_URL, data=signup_data(100 + number),
+                REMOTE_ADDR='10.0.0.2',
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что отклоненные запросы не забирают жетоны '
+                'из других корзин: один IP не должен исчерпывать общий '
+                'предел для остальных.'
+            )
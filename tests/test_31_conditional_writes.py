@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comments, Review, Title
+
+
+@pytest.fixture
+def thread(user, admin):
+    title = Title.objects.create(name='Терминатор', year=1984)
+    review = Review.objects.create(
+        title=title, author=user, text='Отзыв', score=7
+    )
+    comment = Comments.objects.create(
+        review=review, author=user, text='Комментарий'
+    )
+    Comments.objects.create(review=review, author=admin, text='Ответ')
+    review.refresh_from_db()
+    return title, review, comment
+
+
+def review_url(review):
+    return f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+
+
+def comment_url(review, comment):
+    return f'{review_url(review)}comments/{comment.id}/'
+
+
+def captured_statements(context):
+    """Запросы без BEGIN и загрузки пользователя при аутентификации."""
+
+    statements = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'] != 'BEGIN'
+    ]
+    assert 'FROM "reviews_user"' in statements[0]
+    return statements[1:]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31ConditionalWrites:
+
+    def test_01_author_deletes_comment(self, user_client, thread):
+        _, review, comment = thread
+        url = comment_url(review, comment)
+        user_client.get(review_url(review))
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert len(captured_statements(context)) == 2, (
+            'Проверьте, что комментарий удаляется одним DELETE '
+            'с обновлением счетчика отзыва.'
+        )
+        assert not Comments.objects.filter(pk=comment.pk).exists()
+        review.refresh_from_db()
+        assert review.comments_count == 1
+
+    def test_02_forbidden_and_missing(self, user_client, moderator_client,
+                                      thread):
+        title, review, _ = thread
+        foreign = Comments.objects.exclude(author__username='TestUser').get()
+        response = user_client.delete(comment_url(review, foreign))
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что чужой комментарий удалить нельзя.'
+        )
+        response = user_client.patch(
+            comment_url(review, foreign), data={'text': 'Взлом'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        foreign.refresh_from_db()
+        assert foreign.text == 'Ответ'
+
+        other = Title.objects.create(name='Другое', year=2000)
+        url = (
+            f'/api/v1/titles/{other.id}/reviews/{review.id}/'
+            f'comments/{foreign.id}/'
+        )
+        for client in (user_client, moderator_client):
+            assert client.delete(url).status_code == HTTPStatus.NOT_FOUND
+            response = client.patch(url, data={'text': 'Новый'})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что идентификаторы из URL проверяются '
+                'в условии запроса.'
+            )
+
+        response = moderator_client.delete(comment_url(review, foreign))
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        review.refresh_from_db()
+        assert review.comments_count == 1
+
+    def test_03_text_patch(self, user_client, thread):
+        _, review, comment = thread
+        user_client.get(review_url(review))
+        for url, model, pk in (
+            (review_url(review), Review, review.pk),
+            (comment_url(review, comment), Comments, comment.pk),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.patch(url, data={'text': 'Новый'})
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['text'] == 'Новый'
+            statements = captured_statements(context)
+            assert statements[0].startswith('UPDATE')
+            assert len(statements) == 2, (
+                f'Проверьте, что PATCH текста `{url}` выполняется '
+                'одним UPDATE с чтением результата.'
+            )
+            assert model.objects.get(pk=pk).text == 'Новый'
+
+        response = user_client.patch(review_url(review), data={'text': ''})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_score_patch_updates_rating(self, user_client, thread):
+        title, review, _ = thread
+        response = user_client.patch(
+            review_url(review), data={'text': 'Новый', 'score': 3}
+        )
+        assert response.status_code == HTTPStatus.OK
+        title.refresh_from_db()
+        assert title.rating == 3, (
+            'Проверьте, что смена оценки обновляет рейтинг произведения.'
+        )
+
+    def test_05_response_cache_invalidated(self, user_client, thread):
+        _, review, comment = thread
+        url = f'{review_url(review)}comments/'
+        user_client.get(url)
+        user_client.patch(comment_url(review, comment), data={'text': 'Но'})
+        texts = {item['text'] for item in user_client.get(url).json()[
+            'results'
+        ]}
+        assert 'Но' in texts, (
+            'Проверьте, что изменение комментария обновляет кэш ответов.'
+        )
+        user_client.delete(comment_url(review, comment))
+        response = user_client.get(review_url(review))
+        assert response.json()['comments_count'] == 1
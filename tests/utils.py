@@ -305,3 +305,19 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def walk_cursor_pages(client, url):
+    """Проходит все страницы курсорной пагинации и собирает `id`."""
+
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в курсорном режиме ответ не содержит `count`.'
+        )
+        ids.extend(item['id'] for item in data['results'])
+        url = data['next']
+    return ids